@@ -1,8 +1,11 @@
+from pathlib import Path
+
 from PIL import Image
-import os
 
-# Path to the garden images
-image_dir = r"client\focusguard-dashboard\src\assets\images\garden_images"
+# Path to the garden images, resolved once relative to the repo root so the
+# script works from any working directory and on any OS
+REPO_ROOT = Path(__file__).resolve().parent.parent
+image_dir = REPO_ROOT / "client" / "focusguard-dashboard" / "src" / "assets" / "images" / "garden_images"
 images = [
     "GST DACAR 121-02.jpg",
     "GST DACAR 121-03.jpg",
@@ -39,15 +42,14 @@ def remove_white_background(image_path, output_path, threshold=240):
     
     # Save as PNG
     img.save(output_path, "PNG")
-    print(f"Processed: {os.path.basename(image_path)} -> {os.path.basename(output_path)}")
+    print(f"Processed: {Path(image_path).name} -> {Path(output_path).name}")
 
 # Process all images
 for image_name in images:
-    input_path = os.path.join(image_dir, image_name)
-    output_name = image_name.replace('.jpg', '.png')
-    output_path = os.path.join(image_dir, output_name)
+    input_path = image_dir / image_name
+    output_path = input_path.with_suffix('.png')
     
-    if os.path.exists(input_path):
+    if input_path.exists():
         remove_white_background(input_path, output_path, threshold=240)
     else:
         print(f"Image not found: {input_path}")
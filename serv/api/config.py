@@ -5,7 +5,7 @@ Loads environment variables and provides application configuration.
 Uses pydantic-settings for type-safe configuration management.
 """
 
-from typing import List, Union
+from typing import List, Optional, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 
@@ -152,6 +152,57 @@ class Settings(BaseSettings):
         description="Qdrant API key (required for Qdrant Cloud, leave empty for local)"
     )
     
+    qdrant_prefer_grpc: bool = Field(
+        default=True,
+        description="Talk to Qdrant over gRPC instead of REST (faster upserts/search)"
+    )
+    
+    qdrant_grpc_port: int = Field(
+        default=6334,
+        description="Qdrant gRPC port (used when QDRANT_PREFER_GRPC=True)"
+    )
+    
+    qdrant_pool_size: int = Field(
+        default=64,
+        description="Max pooled (keep-alive) REST connections to Qdrant"
+    )
+    
+    qdrant_scalar_quantization: bool = Field(
+        default=False,
+        description="Create the Qdrant collection with INT8 scalar quantization (4x less vector RAM)"
+    )
+    
+    qdrant_on_disk_vectors: bool = Field(
+        default=False,
+        description="Memory-map vectors of newly created collections (HNSW graph stays in RAM)"
+    )
+    
+    qdrant_on_disk_payload: bool = Field(
+        default=False,
+        description="Keep payloads of newly created collections on disk (indexed fields stay in RAM)"
+    )
+    
+    qdrant_hnsw_ef: int = Field(
+        default=64,
+        description="Minimum HNSW search beam width; searches use max(ef, 4 * top_k)"
+    )
+    
+    qdrant_quantization_oversampling: float = Field(
+        default=2.0,
+        description="With scalar quantization, rescore top_k * oversampling INT8 candidates at full precision"
+    )
+    
+    qdrant_float16_vectors: bool = Field(
+        default=False,
+        description="Create the Qdrant collection with float16 vector storage (2x less vector memory)"
+    )
+    
+    qdrant_upload_batch_size: int = Field(
+        default=64,
+        ge=1,
+        description="Points per Qdrant upsert request during knowledge base ingestion"
+    )
+    
     qdrant_collection_name: str = Field(
         default="focusguard_knowledge",
         description="Qdrant collection name for RAG documents"
@@ -195,6 +246,26 @@ class Settings(BaseSettings):
         description="Device for sentence transformers (cpu, cuda, mps)"
     )
     
+    sentence_transformer_quantized: bool = Field(
+        default=False,
+        description="Run the INT8-quantized ONNX export of the model on CPU (needs optimum[onnxruntime])"
+    )
+    
+    sentence_transformer_fp16: bool = Field(
+        default=False,
+        description="Run the local embedding model in float16 (GPU devices only)"
+    )
+    
+    sentence_transformer_compile: bool = Field(
+        default=False,
+        description="Compile the local embedding model with torch.compile (slower startup, faster encode)"
+    )
+    
+    sentence_transformer_threads: Optional[int] = Field(
+        default=None,
+        description="PyTorch CPU threads for local embeddings, applied once per process (None = CPUs in the process affinity mask)"
+    )
+    
     # ========================================================================
     # LLM Generation Settings
     # ========================================================================
@@ -271,6 +342,40 @@ class Settings(BaseSettings):
         description="Maximum retry attempts for failed LLM requests"
     )
     
+    llm_max_context_tokens: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="LLM context window in tokens; context is trimmed so prompt plus reply fit (unset = no limit)"
+    )
+    
+    rag_warmup_on_startup: bool = Field(
+        default=False,
+        description="Initialize and warm up the RAG pipeline in the background at startup instead of on the first chat request"
+    )
+    
+    llm_semantic_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse answers for near-duplicate queries over the same context (uses the RAG embedder)"
+    )
+    
+    llm_semantic_cache_threshold: float = Field(
+        default=0.92,
+        ge=0.0,
+        le=1.0,
+        description="Minimum query similarity for a semantic cache hit"
+    )
+    
+    llm_semantic_cache_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file that persists semantic cache entries across restarts (unset = memory only)"
+    )
+    
+    llm_cache_max_entries: int = Field(
+        default=256,
+        ge=1,
+        description="Maximum cached LLM responses before oldest entries are evicted"
+    )
+    
     # ========================================================================
     # RAG Pipeline Settings
     # ========================================================================
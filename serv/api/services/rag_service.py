@@ -5,6 +5,8 @@ Business logic for RAG (Retrieval-Augmented Generation) queries.
 Coordinates retrieval from vector store and generation from LLM.
 """
 
+import asyncio
+import json
 import logging
 import re
 from typing import List, Optional, Dict, Any
@@ -18,6 +20,17 @@ from api.schemas.rag import RAGQueryResponse, SourceDocument
 logger = logging.getLogger(__name__)
 
 
+# Stats/analytics intent patterns, compiled once as a single alternation
+_STATS_QUERY_RE = re.compile('|'.join([
+    r'\b(analyze|analyse)\b.*\b(trend|stat|progress|performance)\b',
+    r'\b(my|mine)\b.*\b(trend|stat|progress|performance|session)\b',
+    r'\bhow\s+(am\s+i|have\s+i)\b.*\b(doing|performing|progressing)\b',
+    r'\b(show|give|tell)\s+me\s+my\b',
+    r'\bmy\s+(focus|productivity|distraction)\s+(pattern|trend|stat)\b',
+    r'\b(recent|latest)\s+(session|progress|performance)\b',
+]))
+
+
 class RAGService:
     """Handles RAG query processing."""
     
@@ -63,9 +76,16 @@ class RAGService:
             if settings.use_local_embeddings:
                 logger.info("[RAG] Using local sentence transformer embeddings...")
                 from rag.embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
-                self.embedder = SentenceTransformerEmbedder(
+                # Model load (and optional compile warm-up) is blocking and can
+                # take seconds; keep the event loop serving requests meanwhile
+                self.embedder = await asyncio.to_thread(
+                    SentenceTransformerEmbedder,
                     model_name=getattr(settings, 'sentence_transformer_model', 'all-MiniLM-L6-v2'),
-                    device=getattr(settings, 'sentence_transformer_device', 'cpu')
+                    device=getattr(settings, 'sentence_transformer_device', 'cpu'),
+                    quantized=getattr(settings, 'sentence_transformer_quantized', False),
+                    num_threads=getattr(settings, 'sentence_transformer_threads', None),
+                    fp16=getattr(settings, 'sentence_transformer_fp16', False),
+                    compile_model=getattr(settings, 'sentence_transformer_compile', False)
                 )
             else:
                 logger.info("[RAG] Using OpenAI cloud embeddings (production mode)...")
@@ -85,7 +105,16 @@ class RAGService:
                 url=settings.qdrant_url,
                 collection_name=settings.qdrant_collection_name,
                 vector_size=self.embedder.dimension,
-                api_key=settings.qdrant_api_key if settings.qdrant_api_key else None
+                api_key=settings.qdrant_api_key if settings.qdrant_api_key else None,
+                prefer_grpc=settings.qdrant_prefer_grpc,
+                grpc_port=settings.qdrant_grpc_port,
+                pool_size=settings.qdrant_pool_size,
+                scalar_quantization=settings.qdrant_scalar_quantization,
+                quantization_oversampling=settings.qdrant_quantization_oversampling,
+                hnsw_ef=settings.qdrant_hnsw_ef,
+                on_disk_vectors=settings.qdrant_on_disk_vectors,
+                on_disk_payload=settings.qdrant_on_disk_payload,
+                float16_vectors=settings.qdrant_float16_vectors
             )
             await self.vector_store.initialize()
             
@@ -97,11 +126,27 @@ class RAGService:
                 enable_preprocessing=True,
                 min_score_threshold=0.3  # Filter low-relevance results
             )
+            try:
+                await self.retriever.warmup(self.retriever.WARMUP_QUERIES)
+            except Exception as e:
+                # Only a latency optimization - the first query will just be slower
+                logger.warning(f"[RAG] Retriever warmup failed: {e}")
             
             # Initialize generator
             logger.info("[RAG] Loading LLM generator...")
             self.generator = get_generator()
             
+            # Semantic response cache shares the already-loaded embedder
+            if settings.llm_semantic_cache_enabled and hasattr(self.generator, 'semantic_cache'):
+                from rag.generation.cache import SemanticCache
+                self.generator.semantic_cache = SemanticCache(
+                    embedder=self.embedder,
+                    threshold=settings.llm_semantic_cache_threshold,
+                    max_entries=settings.llm_cache_max_entries,
+                    path=settings.llm_semantic_cache_path or None
+                )
+                logger.info("[RAG] Semantic response cache enabled")
+            
             self._initialized = True
             logger.info("✅ RAG service initialized successfully")
         except Exception as e:
@@ -137,6 +182,10 @@ class RAGService:
         Returns:
             RAGQueryResponse with generated answer and optional sources
         """
+        greeting = self._greeting_response(query, include_sources)
+        if greeting is not None:
+            return greeting
+        
         if not self._initialized:
             await self.initialize()
         
@@ -217,7 +266,8 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
                 answer = await self.generator.generate(
                     query=query,
                     context_documents=[conversational_prompt],
-                    system_prompt=""
+                    system_prompt="",
+                    cache_context=self._cache_context("conversational")
                 )
                 
                 return RAGQueryResponse(
@@ -247,7 +297,10 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
                 answer = await self.generator.generate(
                     query=query,
                     context_documents=[stats_prompt],
-                    system_prompt=""
+                    system_prompt="",
+                    cache_context=self._cache_context(
+                        "stats", context_docs[:2], user_stats_context
+                    )
                 )
             else:
                 # Generate answer using LLM with knowledge base context
@@ -320,6 +373,13 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
         Returns:
             RAGQueryResponse with context-aware answer
         """
+        # Only a greeting that opens a conversation is canned; mid-conversation
+        # greetings still go to the LLM so the reply can acknowledge the history
+        if not conversation_history:
+            greeting = self._greeting_response(query, include_sources)
+            if greeting is not None:
+                return greeting
+        
         if not self._initialized:
             await self.initialize()
         
@@ -366,7 +426,10 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
                 answer = await self.generator.generate(
                     query=query,
                     context_documents=[prompt],
-                    system_prompt=""
+                    system_prompt="",
+                    cache_context=self._cache_context(
+                        "conversational", conversation_history=conversation_history
+                    )
                 )
                 
                 return RAGQueryResponse(
@@ -401,7 +464,10 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
                 answer = await self.generator.generate(
                     query=query,
                     context_documents=[stats_prompt],
-                    system_prompt=""
+                    system_prompt="",
+                    cache_context=self._cache_context(
+                        "stats", context_docs[:2], user_stats_context, conversation_history
+                    )
                 )
             else:
                 # Regular RAG with conversation context
@@ -414,7 +480,10 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
                 answer = await self.generator.generate(
                     query=query,
                     context_documents=[prompt],
-                    system_prompt=""
+                    system_prompt="",
+                    cache_context=self._cache_context(
+                        "conversation", context_docs, conversation_history=conversation_history
+                    )
                 )
             
             # Build sources
@@ -442,6 +511,11 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
             logger.error(f"[RAG Query w/ Conversation] FAILED: {e}", exc_info=True)
             raise
     
+    async def close(self) -> None:
+        """Cancel in-flight retriever work. Call during application shutdown."""
+        if self.retriever is not None:
+            await self.retriever.close()
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check health status of all RAG components."""
         if not self._initialized:
@@ -463,23 +537,64 @@ Respond naturally and helpfully. If it's a greeting, introduce yourself warmly.
             "documents_count": doc_count
         }
     
+    @staticmethod
+    def _greeting_response(query: str, include_sources: bool) -> Optional[RAGQueryResponse]:
+        """
+        Canned reply for a bare greeting, or None for anything else.
+        
+        Checked before initialize(), so a greeting never waits for (or
+        fails on) the embedder, Qdrant or the generator.
+        """
+        from rag.generation.prompts import match_greeting
+        greeting = match_greeting(query)
+        if greeting is None:
+            return None
+        
+        logger.info("[RAG Query] Greeting - returning canned response")
+        return RAGQueryResponse(
+            answer=greeting,
+            sources=[] if include_sources else None,
+            query=query,
+            model_used="system_message"
+        )
+    
     def _is_stats_query(self, query: str) -> bool:
         """
         Detect if query is asking for personal stats/analytics.
         
         Keywords: analyze, stats, trends, progress, how am i doing, performance, etc.
         """
-        stats_keywords = [
-            r'\b(analyze|analyse)\b.*\b(trend|stat|progress|performance)\b',
-            r'\b(my|mine)\b.*\b(trend|stat|progress|performance|session)\b',
-            r'\bhow\s+(am\s+i|have\s+i)\b.*\b(doing|performing|progressing)\b',
-            r'\b(show|give|tell)\s+me\s+my\b',
-            r'\bmy\s+(focus|productivity|distraction)\s+(pattern|trend|stat)\b',
-            r'\b(recent|latest)\s+(session|progress|performance)\b'
-        ]
+        return _STATS_QUERY_RE.search(query.lower()) is not None
+    
+    @staticmethod
+    def _cache_context(
+        kind: str,
+        context_docs: Optional[List[str]] = None,
+        user_stats: Optional[Dict[str, Any]] = None,
+        conversation_history: Optional[List[dict]] = None
+    ) -> List[str]:
+        """
+        Build query-independent semantic cache key parts for a rendered prompt.
         
-        query_lower = query.lower()
-        return any(re.search(pattern, query_lower) for pattern in stats_keywords)
+        These paths hand the generator one fully rendered prompt, which
+        contains the query itself; keying the cache on it would make every
+        rephrasing a miss. Key on the inputs that shaped the prompt instead.
+        
+        Args:
+            kind: Prompt template name (keeps templates from sharing answers)
+            context_docs: Retrieved documents included in the prompt
+            user_stats: User stats included in the prompt
+            conversation_history: Conversation messages included in the prompt
+        
+        Returns:
+            Strings to pass as cache_context to generator.generate()
+        """
+        parts = [kind, *(context_docs or [])]
+        if user_stats is not None:
+            parts.append(json.dumps(user_stats, sort_keys=True, default=str))
+        for msg in conversation_history or []:
+            parts.append(f"{msg.get('role')}: {msg.get('content')}")
+        return parts
     
     async def _fetch_user_stats(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
         """
@@ -573,3 +688,21 @@ def get_rag_service() -> RAGService:
     if _rag_service is None:
         _rag_service = RAGService()
     return _rag_service
+
+
+async def shutdown_rag_service() -> None:
+    """
+    Release RAG resources and reset the singleton.
+    
+    Also closes the LLM client, which the conversation routes can create
+    without the RAG service. Call this during application shutdown (in
+    main.py lifespan).
+    """
+    global _rag_service
+    
+    if _rag_service is not None:
+        await _rag_service.close()
+        _rag_service = None
+    
+    from rag.generation.config import shutdown_generator
+    await shutdown_generator()
@@ -152,8 +152,19 @@ async def lifespan(app: FastAPI):
                 except Exception as e:
                     print(f"[WARNING] Table creation error: {str(e)[:100]}")
             
-            # RAG is disabled (was causing crashes)
-            print("[INFO] AI Tutor disabled - skipping RAG initialization")
+            # RAG stays lazy by default (eager startup init was causing crashes);
+            # opt in to load models and prefetch common queries before the
+            # first chat request instead of serving it from the fallback
+            if settings.rag_warmup_on_startup:
+                print("[INFO] AI Tutor warming up in background...")
+                try:
+                    from api.services.rag_service import get_rag_service
+                    await get_rag_service().initialize()
+                    print("[OK] AI Tutor ready")
+                except Exception as e:
+                    print(f"[WARNING] AI Tutor warmup failed (chat will use the direct LLM fallback): {str(e)[:100]}")
+            else:
+                print("[INFO] AI Tutor disabled - skipping RAG initialization")
             print("[OK] Background startup complete")
             
         except Exception as e:
@@ -168,6 +179,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("[*] Shutting down...")
+    try:
+        from api.services.rag_service import shutdown_rag_service
+        await shutdown_rag_service()
+    except Exception as e:
+        print(f"[WARNING] RAG shutdown error: {str(e)[:100]}")
     try:
         await asyncio.wait_for(close_db(), timeout=2.0)
         print("[OK] Shutdown complete")
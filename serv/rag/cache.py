@@ -0,0 +1,91 @@
+"""
+Shared In-Process Caches
+
+Small, dependency-free cache primitives used by both the retrieval and
+generation layers.
+
+- fingerprint: stable 64-bit content hash, usable as a cache key across
+  processes.
+- ExactCache: bounded LRU keyed by fingerprint.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def fingerprint(*parts: str) -> int:
+    """
+    Stable 64-bit content hash of one or more strings.
+
+    Unlike hash(), the value is identical across processes, so it can be
+    stored alongside cached entries.
+
+    Example:
+        >>> fingerprint("system prompt", "doc 1", "doc 2") == fingerprint("system prompt", "doc 1", "doc 2")
+        True
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")  # Separator so ("ab", "c") != ("a", "bc")
+    return int.from_bytes(digest.digest(), "big", signed=True)
+
+
+class ExactCache:
+    """
+    Bounded LRU cache keyed by exact request fingerprint.
+
+    Only safe for deterministic calls (temperature=0), where the response
+    is a pure function of model, prompt and sampling parameters.
+
+    Example:
+        ```python
+        cache = ExactCache(max_entries=512)
+        key = fingerprint(model, prompt, repr(config))
+
+        answer = cache.get(key)
+        if answer is None:
+            answer = await call_llm(...)
+            cache.put(key, answer)
+        ```
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Return the cached value and mark it most recently used.
+        """
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: int, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entry when full.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"ExactCache(size={len(self._entries)}/{self.max_entries}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
@@ -30,8 +30,9 @@ Example usage:
 """
 
 from .base_embedder import BaseEmbedder
-from .sentence_transformer_embedder import SentenceTransformerEmbedder
+from .sentence_transformer_embedder import SentenceTransformerEmbedder, is_model_cached
 from .config import get_embedder, initialize_embedder, reset_embedder
+from .embedding_cache import EmbeddingCache
 
 # Conditional import - only available if openai package is installed
 try:
@@ -46,6 +47,8 @@ __all__ = [
     "BaseEmbedder",
     "OpenAIEmbedder",
     "SentenceTransformerEmbedder",
+    "is_model_cached",
+    "EmbeddingCache",
     "get_embedder",
     "initialize_embedder",
     "reset_embedder",
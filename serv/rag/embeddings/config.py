@@ -58,6 +58,10 @@ def get_embedder() -> BaseEmbedder:
                 model_name=settings.sentence_transformer_model,
                 device=settings.sentence_transformer_device,
                 batch_size=32,
+                quantized=settings.sentence_transformer_quantized,
+                num_threads=settings.sentence_transformer_threads,
+                fp16=settings.sentence_transformer_fp16,
+                compile_model=settings.sentence_transformer_compile,
             )
             logger.info(
                 f"Created LOCAL embedder: {settings.sentence_transformer_model} "
@@ -0,0 +1,111 @@
+"""
+Persistent Embedding Cache
+
+SQLite-backed store of chunk embeddings keyed by content hash, so
+re-ingesting a mostly unchanged knowledge base only embeds the chunks
+that actually changed.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of float32 embeddings keyed by blake2b(model + text).
+
+    Keys include the model name, so switching models never serves stale
+    vectors. Stdlib sqlite3 only - no extra dependency.
+
+    Example:
+        ```python
+        cache = EmbeddingCache(".embedding_cache.sqlite", model_name="all-MiniLM-L6-v2")
+
+        hits = cache.get_many(texts)            # {index: vector}
+        misses = [i for i in range(len(texts)) if i not in hits]
+        vectors = await embedder.embed_batch([texts[i] for i in misses], return_numpy=True)
+        cache.put_many([texts[i] for i in misses], vectors)
+        ```
+    """
+
+    def __init__(self, path: Union[str, Path], model_name: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file path
+            model_name: Embedding model the vectors belong to
+        """
+        self.path = Path(path)
+        self.model_name = model_name
+        # The embedder uses the cache from its worker thread; callers must
+        # still serialize access (the embedder's executor has one worker)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        # Not a security boundary - blake2b is just the fastest stdlib hash
+        return hashlib.blake2b(
+            f"{self.model_name}\x1f{text}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Mapping of index in texts -> cached float32 vector (hits only)
+        """
+        if not texts:
+            return {}
+
+        keys = [self._key(text) for text in texts]
+        found = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            )
+            found.update(rows)
+
+        return {
+            i: np.frombuffer(found[key], dtype=np.float32)
+            for i, key in enumerate(keys)
+            if key in found
+        }
+
+    def put_many(self, texts: List[str], vectors: Union[np.ndarray, List[List[float]]]) -> None:
+        """
+        Store embeddings for texts (overwrites existing entries).
+        """
+        if not texts:
+            return
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(self._key(text), row.tobytes()) for text, row in zip(texts, matrix)],
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
@@ -5,19 +5,161 @@ Free, local text embeddings using HuggingFace sentence-transformers.
 No API keys required, runs completely offline on CPU/GPU.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Union
 import logging
 import asyncio
+import os
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 
+import numpy as np
+import torch
+from huggingface_hub import try_to_load_from_cache
 from sentence_transformers import SentenceTransformer
 
 from .base_embedder import BaseEmbedder
+from .embedding_cache import EmbeddingCache
 
 
 logger = logging.getLogger(__name__)
 
 
+# Batch sizes traced once after torch.compile so live requests don't recompile
+COMPILE_WARMUP_BATCH_SIZES = (1, 4, 8, 16, 32)
+
+
+def is_model_cached(model_name: str) -> bool:
+    """
+    Check whether a model's weights are already in the local HF cache.
+    
+    Lets callers (tests, startup probes) avoid a ~100 MB download on cold
+    machines. Short names resolve to the sentence-transformers org, the
+    same way SentenceTransformer() does.
+    
+    Args:
+        model_name: e.g. 'all-MiniLM-L6-v2' or 'org/model'
+        
+    Returns:
+        True if the model config is cached locally
+    """
+    repo_id = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+    cached = try_to_load_from_cache(repo_id=repo_id, filename='config.json')
+    return isinstance(cached, str)
+
+
+def _available_cpus() -> int:
+    """
+    CPUs this process may run on (affinity/cpuset aware, unlike os.cpu_count).
+    """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        # Not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+# Intra-op thread count applied by the first embedder in this process
+_torch_threads: Optional[int] = None
+
+
+def _configure_torch_threads(num_threads: Optional[int]) -> int:
+    """
+    Pin PyTorch's intra-op pool and set inter-op to 1, once per process.
+    
+    Container runtimes often make torch pick a single intra-op thread,
+    which leaves CPU encoding an order of magnitude slower than it could be.
+    Thread counts are process-global, so only the first embedder applies
+    them; later ones get the same result back.
+    
+    Args:
+        num_threads: Configured thread count (None = CPUs in this
+                     process's affinity mask)
+        
+    Returns:
+        Intra-op thread count in effect
+    """
+    global _torch_threads
+    
+    if _torch_threads is not None:
+        if num_threads and num_threads != _torch_threads:
+            logger.warning(
+                f'PyTorch threads already set to {_torch_threads} for this '
+                f'process; ignoring num_threads={num_threads}'
+            )
+        return _torch_threads
+    
+    torch.set_num_threads(num_threads or _available_cpus())
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before the first parallel op; keep whatever is in place
+        pass
+    _torch_threads = torch.get_num_threads()
+    return _torch_threads
+
+
+def _resolve_device(device: Optional[str]) -> str:
+    """
+    Device type the model will run on ('cuda', 'mps' or 'cpu').
+    
+    Mirrors sentence-transformers' default when device is None.
+    """
+    if device is not None:
+        return torch.device(device).type
+    if torch.cuda.is_available():
+        return 'cuda'
+    if torch.backends.mps.is_available():
+        return 'mps'
+    return 'cpu'
+
+
+@lru_cache(maxsize=4)
+def _load_model(
+    model_name: str,
+    device: Optional[str],
+    onnx_file: Optional[str],
+    fp16: bool = False,
+    compile_model: bool = False,
+) -> SentenceTransformer:
+    """
+    Load a SentenceTransformer once per (model, device, backend) per process.
+    
+    The API, the ingestion script and the test suite each create their own
+    embedder; sharing the loaded weights avoids repeating the model load
+    (and its ~100 MB of memory) for every instance.
+    """
+    logger.info(
+        f'Loading sentence-transformer model: {model_name}'
+        f'{" (INT8 ONNX)" if onnx_file else ""}{" (fp16)" if fp16 else ""}'
+    )
+    if onnx_file:
+        return SentenceTransformer(
+            model_name,
+            device=device,
+            backend='onnx',
+            model_kwargs={'file_name': onnx_file},
+        )
+    if fp16:
+        # model_kwargs needs sentence-transformers>=3.0; the fp32 default
+        # path must keep working on the 2.x releases requirements allow
+        model = SentenceTransformer(
+            model_name, device=device, model_kwargs={'torch_dtype': torch.float16}
+        )
+    else:
+        model = SentenceTransformer(model_name, device=device)
+    
+    if compile_model:
+        # Compile the transformer module in place (pooling/normalize stay
+        # eager). dynamic=True avoids a recompile for every new sequence length
+        model[0].compile(dynamic=True)
+        for batch_size in COMPILE_WARMUP_BATCH_SIZES:
+            model.encode(['warm up'] * batch_size, batch_size=batch_size)
+        logger.info(f'Compiled {model_name} with torch.compile')
+    
+    return model
+
+
 class SentenceTransformerEmbedder(BaseEmbedder):
     """
     Free local embedder using sentence-transformers (HuggingFace).
@@ -34,6 +176,20 @@ class SentenceTransformerEmbedder(BaseEmbedder):
     - all-mpnet-base-v2: 768 dims, slower, better quality
     - all-MiniLM-L12-v2: 384 dims, balanced
     
+    CPU deployments can pass quantized=True to run the INT8 dynamic-quantized
+    ONNX export published with these models through ONNX Runtime
+    (requires sentence-transformers>=3.2 and optimum[onnxruntime]).
+    Outputs are still float32 after pooling, so downstream code is unchanged.
+    GPU deployments can pass fp16=True instead to run the PyTorch model in
+    half precision (requires sentence-transformers>=3.0; embeddings are
+    cast back to float32), and compile_model=True to run the PyTorch
+    model through torch.compile
+    (compiled once per process, warmed up over common batch sizes).
+    
+    Passing cache_path keeps a persistent content-hash cache of embeddings,
+    so texts seen before (re-ingestion, repeated test corpora) skip the
+    model entirely.
+    
     Example:
         embedder = SentenceTransformerEmbedder(
             model_name='all-MiniLM-L6-v2'
@@ -55,12 +211,21 @@ class SentenceTransformerEmbedder(BaseEmbedder):
         'paraphrase-mpnet-base-v2': 768,
     }
     
+    # INT8 ONNX export shipped in the sentence-transformers model repos
+    QUANTIZED_ONNX_FILE = 'onnx/model_qint8_avx512_vnni.onnx'
+    
     def __init__(
         self,
         model_name: str = 'all-MiniLM-L6-v2',
         device: Optional[str] = None,
         batch_size: int = 32,
         show_progress: bool = False,
+        normalize_embeddings: bool = True,
+        quantized: bool = False,
+        num_threads: Optional[int] = None,
+        fp16: bool = False,
+        compile_model: bool = False,
+        cache_path: Optional[Union[str, Path]] = None,
     ):
         if model_name not in self.MODEL_DIMENSIONS:
             logger.warning(
@@ -71,10 +236,31 @@ class SentenceTransformerEmbedder(BaseEmbedder):
         self.model_name = model_name
         self.batch_size = batch_size
         self.show_progress = show_progress
+        # Unit-length output lets downstream cosine reduce to a dot product
+        self.normalize_embeddings = normalize_embeddings
+        self.quantized = quantized
+        # Half precision only pays off on GPU; the INT8 ONNX path takes precedence
+        self.fp16 = fp16 and not quantized
+        if self.fp16:
+            device_type = _resolve_device(device)
+            if device_type not in ('cuda', 'mps'):
+                logger.warning(
+                    f'fp16 needs a CUDA or MPS device; ignoring it on {device_type}'
+                )
+                self.fp16 = False
+        self.compile_model = compile_model and not quantized
+        
+        # Set before the model loads; defaults to the CPUs we may run on
+        self.num_threads = _configure_torch_threads(num_threads)
         
-        # Load model (downloads on first use)
-        logger.info(f'Loading sentence-transformer model: {model_name}')
-        self.model = SentenceTransformer(model_name, device=device)
+        # Load model (downloads on first use; shared across instances)
+        self.model = _load_model(
+            model_name,
+            device,
+            self.QUANTIZED_ONNX_FILE if quantized else None,
+            self.fp16,
+            self.compile_model,
+        )
         
         # Auto-detect dimension
         self._dimension = self.model.get_sentence_embedding_dimension()
@@ -82,57 +268,126 @@ class SentenceTransformerEmbedder(BaseEmbedder):
         # Thread pool for async execution
         self._executor = ThreadPoolExecutor(max_workers=1)
         
+        # Quantized / half-precision vectors differ slightly and
+        # unnormalized ones differ in length, so they get their own cache keys
+        self.cache: Optional[EmbeddingCache] = None
+        if cache_path is not None:
+            variant = ':int8' if self.quantized else ':fp16' if self.fp16 else ''
+            if not self.normalize_embeddings:
+                variant += ':raw'
+            self.cache = EmbeddingCache(cache_path, model_name=f'{model_name}{variant}')
+        
         logger.info(
             f'Initialized SentenceTransformerEmbedder: '
             f'model={model_name}, dimension={self._dimension}, '
-            f'device={self.model.device}'
+            f'device={self.model.device}, threads={self.num_threads}'
         )
     
     @property
     def dimension(self) -> int:
         return self._dimension
     
-    async def embed_text(self, text: str) -> List[float]:
-        vectors = await self.embed_batch([text])
+    async def embed_text(
+        self,
+        text: str,
+        return_numpy: bool = False
+    ) -> Union[List[float], np.ndarray]:
+        vectors = await self.embed_batch([text], return_numpy=return_numpy)
         return vectors[0]
     
     async def embed_batch(
         self,
         texts: List[str],
-        show_progress: bool = False
-    ) -> List[List[float]]:
+        show_progress: bool = False,
+        return_numpy: bool = False
+    ) -> Union[List[List[float]], np.ndarray]:
+        """
+        Embed texts in a worker thread.
+        
+        With return_numpy=True the raw (N, dimension) float32 matrix from
+        the encoder is returned as-is; rows are L2-normalized (unless
+        normalize_embeddings=False), so cosine similarity between them is a
+        plain dot product. Otherwise the matrix is converted to nested
+        lists for list-based callers.
+        """
         if not texts:
             logger.warning('Empty text list provided')
-            return []
+            return np.empty((0, self._dimension), dtype=np.float32) if return_numpy else []
+        
+        show_progress = show_progress or self.show_progress
+        if self.cache is not None:
+            embeddings = await self._encode_cached(texts, show_progress)
+        else:
+            embeddings = await self._encode(texts, show_progress)
+        
+        logger.info(f'Embedded {len(texts)} texts using {self.model_name}')
+        
+        if return_numpy:
+            return embeddings
         
-        # Run in thread pool (sentence-transformers is synchronous)
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
+        # Single C-level conversion instead of one tolist() per row
+        return embeddings.tolist()
+    
+    async def _encode(self, texts: List[str], show_progress: bool) -> np.ndarray:
+        # Run in thread pool (sentence-transformers is synchronous; the
+        # PyTorch/ONNX forward pass releases the GIL)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
             self._executor,
             self._encode_sync,
             texts,
-            show_progress or self.show_progress
+            show_progress
         )
+    
+    async def _encode_cached(self, texts: List[str], show_progress: bool) -> np.ndarray:
+        # SQLite lookups/writes block too, so the whole cached path runs on
+        # the (single) worker thread, which also serializes cache access
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self._encode_cached_sync,
+            texts,
+            show_progress
+        )
+    
+    def _encode_cached_sync(self, texts: List[str], show_progress: bool) -> np.ndarray:
+        """
+        Encode only the texts missing from the cache and store their vectors.
+        """
+        hits = self.cache.get_many(texts)
+        miss_indices = [i for i in range(len(texts)) if i not in hits]
         
-        # Convert numpy to lists
-        embeddings_list = [emb.tolist() for emb in embeddings]
+        embeddings = np.empty((len(texts), self._dimension), dtype=np.float32)
+        for i, vector in hits.items():
+            embeddings[i] = vector
         
-        logger.info(f'Embedded {len(texts)} texts using {self.model_name}')
+        if miss_indices:
+            miss_texts = [texts[i] for i in miss_indices]
+            vectors = self._encode_sync(miss_texts, show_progress)
+            embeddings[miss_indices] = vectors
+            self.cache.put_many(miss_texts, vectors)
         
-        return embeddings_list
+        logger.debug(f'Embedding cache: {len(hits)} hits, {len(miss_indices)} encoded')
+        return embeddings
     
     def _encode_sync(
         self,
         texts: List[str],
         show_progress: bool
-    ) -> List:
-        return self.model.encode(
+    ) -> np.ndarray:
+        # encode() length-sorts the whole input before splitting it into
+        # batches and restores the caller's order afterwards, so padding is
+        # already minimal as long as the full corpus is passed in one call
+        # (don't pre-chunk texts before handing them to embed_batch).
+        embeddings = self.model.encode(
             texts,
             batch_size=self.batch_size,
             show_progress_bar=show_progress,
             convert_to_numpy=True,
-            normalize_embeddings=True,
+            normalize_embeddings=self.normalize_embeddings,
         )
+        # fp16 models return float16; callers and Qdrant expect float32
+        return embeddings.astype(np.float32, copy=False)
     
     def get_model_info(self) -> dict:
         return {
@@ -141,6 +396,11 @@ class SentenceTransformerEmbedder(BaseEmbedder):
             'device': str(self.model.device),
             'max_sequence_length': self.model.max_seq_length,
             'batch_size': self.batch_size,
+            'normalize_embeddings': self.normalize_embeddings,
+            'quantized': self.quantized,
+            'num_threads': self.num_threads,
+            'fp16': self.fp16,
+            'compiled': self.compile_model,
         }
     
     def __repr__(self) -> str:
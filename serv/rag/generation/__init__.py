@@ -37,17 +37,42 @@ Configuration:
     - USE_LOCAL_LLM=True (for Ollama)
 """
 
-from .base_generator import BaseGenerator, GenerationConfig
-from .huggingface_generator import HuggingFaceGenerator
-from .config import get_generator, reset_generator
-from . import prompts
+import importlib
+from typing import Any
+
+# Public name -> submodule that defines it. Resolved on first access so
+# importing one light submodule (e.g. rag.generation.prompts) doesn't load
+# huggingface_hub, NumPy and the settings module
+_EXPORTS = {
+    "BaseGenerator": "base_generator",
+    "GenerationConfig": "base_generator",
+    "HuggingFaceGenerator": "huggingface_generator",
+    "ExactCache": "cache",
+    "SemanticCache": "cache",
+    "fingerprint": "cache",
+    "get_generator": "config",
+    "reset_generator": "config",
+    "shutdown_generator": "config",
+}
 
 __all__ = [
     "BaseGenerator",
     "GenerationConfig",
     "HuggingFaceGenerator",
+    "ExactCache",
+    "SemanticCache",
+    "fingerprint",
     "get_generator",
     "reset_generator",
+    "shutdown_generator",
     "prompts"
 ]
 
+
+def __getattr__(name: str) -> Any:
+    if name == "prompts":
+        return importlib.import_module(".prompts", __name__)
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,7 @@ Base class for LLM-based response generation.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from dataclasses import dataclass
 
 
@@ -37,7 +37,8 @@ class BaseGenerator(ABC):
         query: str,
         context_documents: List[str],
         system_prompt: Optional[str] = None,
-        config: Optional[GenerationConfig] = None
+        config: Optional[GenerationConfig] = None,
+        cache_context: Optional[List[str]] = None
     ) -> str:
         """
         Generate a response using LLM with retrieved context.
@@ -47,6 +48,9 @@ class BaseGenerator(ABC):
             context_documents: Relevant documents from retrieval phase
             system_prompt: Instructions for the LLM (role, tone, constraints)
             config: Generation parameters (temperature, max_tokens, etc.)
+            cache_context: Query-independent strings identifying the context,
+                           for generators with a response cache (defaults to
+                           system_prompt + context_documents)
             
         Returns:
             Generated text response
@@ -63,6 +67,26 @@ class BaseGenerator(ABC):
         """
         pass
     
+    async def generate_stream(
+        self,
+        query: str,
+        context_documents: List[str],
+        system_prompt: Optional[str] = None,
+        config: Optional[GenerationConfig] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response as a stream of text chunks.
+        
+        Providers that support server-side streaming override this so
+        callers can forward tokens as they arrive. The default falls back
+        to generate() and yields the full response as a single chunk.
+        
+        Example:
+            async for chunk in generator.generate_stream(query, docs):
+                await websocket.send_text(chunk)
+        """
+        yield await self.generate(query, context_documents, system_prompt, config)
+    
     def _format_prompt(
         self,
         query: str,
@@ -0,0 +1,260 @@
+"""
+Response Caches for LLM Generation
+
+In-process caches that let the generator skip Inference API round-trips
+for requests it has already answered.
+
+- ExactCache: bounded LRU for deterministic (temperature=0) calls, keyed
+  on the exact prompt and generation parameters.
+- SemanticCache: near-duplicate queries ("How to focus?" vs "How can I
+  focus?") over the *same* context reuse the stored answer. Similarity is
+  a single matrix-vector product over a fixed-size ring buffer of
+  L2-normalized query embeddings. Optionally written through to SQLite so
+  answers survive a restart.
+"""
+
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Union
+
+import numpy as np
+
+from rag.cache import ExactCache, fingerprint
+
+if TYPE_CHECKING:
+    # Annotation only: importing rag.embeddings at runtime loads torch
+    from rag.embeddings.base_embedder import BaseEmbedder
+
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for generated responses.
+
+    Entries are keyed on the query embedding plus a fingerprint of
+    everything else that shapes the answer (system prompt and context
+    documents). A lookup only matches entries with the same fingerprint,
+    so a cached answer is never served for a different user's stats or a
+    different conversation history - only for a rephrased query over the
+    same context.
+
+    Storage is a preallocated (max_entries, dimension) float32 matrix used
+    as a ring buffer: when full, the oldest entry is overwritten (FIFO).
+
+    With a path, every stored response is also written to a SQLite file and
+    the newest max_entries rows are loaded back on construction, so a
+    restarted server answers returning users from cache instead of
+    regenerating. Writes run on a single background thread, so store()
+    never blocks the event loop on disk I/O. Rows are tagged with the
+    embedder's model name; vectors from a different model are never
+    loaded or trimmed.
+
+    Example:
+        ```python
+        cache = SemanticCache(embedder, threshold=0.92)
+
+        embedding = await cache.embed(query)
+        context_key = fingerprint(system_prompt, *context_documents)
+
+        answer = cache.lookup(embedding, context_key)
+        if answer is None:
+            answer = await call_llm(...)
+            cache.store(embedding, context_key, answer)
+        ```
+    """
+
+    def __init__(
+        self,
+        embedder: "BaseEmbedder",
+        threshold: float = 0.92,
+        max_entries: int = 256,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            embedder: Embedder used for query vectors (reuse the RAG embedder)
+            threshold: Minimum cosine similarity for a cache hit (0.0 - 1.0)
+            max_entries: Maximum cached responses before FIFO eviction
+            path: Optional SQLite file to persist responses across restarts
+        """
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        self._embeddings = np.zeros((max_entries, embedder.dimension), dtype=np.float32)
+        self._context_keys = np.zeros(max_entries, dtype=np.int64)
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        
+        # Query text -> normalized embedding, so repeated queries (retries,
+        # duplicate batch entries) are embedded once
+        self._query_embeddings = ExactCache(max_entries=max_entries)
+
+        self.hits = 0
+        self.misses = 0
+
+        self._model_name = getattr(embedder, "model_name", type(embedder).__name__)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        if path is not None:
+            # After loading, the connection is only used from the writer
+            # thread; one worker keeps writes ordered
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-cache")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, model TEXT NOT NULL, "
+                "context_key INTEGER NOT NULL, embedding BLOB NOT NULL, response TEXT NOT NULL)"
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self) -> None:
+        """
+        Refill the ring buffer with the newest persisted responses.
+        """
+        rows = self._conn.execute(
+            "SELECT context_key, embedding, response FROM responses "
+            "WHERE model = ? ORDER BY id DESC LIMIT ?",
+            (self._model_name, self.max_entries),
+        ).fetchall()
+
+        # Oldest first, so eviction order matches the previous process
+        for context_key, blob, response in reversed(rows):
+            embedding = np.frombuffer(blob, dtype=np.float32)
+            if embedding.shape[0] == self._embeddings.shape[1]:
+                self._insert(embedding, context_key, response)
+
+        if self._size:
+            logger.info(f"Loaded {self._size} cached responses from disk")
+
+    async def embed(self, query: str) -> np.ndarray:
+        """
+        Embed a query as an L2-normalized float32 vector (memoized).
+        """
+        key = fingerprint(query)
+        cached = self._query_embeddings.get(key)
+        if cached is not None:
+            return cached
+        
+        vector = np.asarray(await self.embedder.embed_text(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        self._query_embeddings.put(key, vector)
+        return vector
+
+    def lookup(self, embedding: np.ndarray, context_key: int) -> Optional[str]:
+        """
+        Return the cached response for the most similar query, if any.
+
+        Args:
+            embedding: Normalized query embedding (from embed())
+            context_key: fingerprint() of system prompt + context documents
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        if self._size == 0:
+            self.misses += 1
+            return None
+
+        # One GEMV over the filled slots; mask out other contexts
+        sims = self._embeddings[:self._size] @ embedding
+        sims[self._context_keys[:self._size] != context_key] = -1.0
+
+        best = int(np.argmax(sims))
+        if sims[best] >= self.threshold:
+            self.hits += 1
+            logger.debug(f"Semantic cache hit (similarity={sims[best]:.3f})")
+            return self._responses[best]
+
+        self.misses += 1
+        return None
+
+    def store(self, embedding: np.ndarray, context_key: int, response: str) -> None:
+        """
+        Cache a response, evicting the oldest entry when full.
+        """
+        self._insert(embedding, context_key, response)
+
+        if self._writer is not None:
+            self._writer.submit(
+                self._persist,
+                context_key,
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                response,
+            )
+
+    def _persist(self, context_key: int, blob: bytes, response: str) -> None:
+        """
+        Write one response through to disk (runs on the writer thread).
+        """
+        try:
+            self._conn.execute(
+                "INSERT INTO responses (model, context_key, embedding, response) VALUES (?, ?, ?, ?)",
+                (self._model_name, context_key, blob, response),
+            )
+            # Rows older than this model's newest max_entries can never be
+            # loaded again; ids are shared across models, so trim by rank
+            self._conn.execute(
+                "DELETE FROM responses WHERE model = ? AND id NOT IN ("
+                "SELECT id FROM responses WHERE model = ? ORDER BY id DESC LIMIT ?)",
+                (self._model_name, self._model_name, self.max_entries),
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            # Persistence is best-effort; the in-memory entry is already stored
+            logger.warning(f"Failed to persist cached response: {e}")
+
+    def _insert(self, embedding: np.ndarray, context_key: int, response: str) -> None:
+        slot = self._next
+        self._embeddings[slot] = embedding
+        self._context_keys[slot] = context_key
+        self._responses[slot] = response
+
+        self._next = (slot + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+
+    def clear(self) -> None:
+        """
+        Drop all cached responses.
+        """
+        self._responses = [None] * self.max_entries
+        self._size = 0
+        self._next = 0
+        self._query_embeddings.clear()
+
+        if self._writer is not None:
+            self._writer.submit(self._delete_all)
+
+    def _delete_all(self) -> None:
+        self._conn.execute("DELETE FROM responses WHERE model = ?", (self._model_name,))
+        self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Flush pending writes and close the cache file.
+        """
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return (
+            f"SemanticCache(size={self._size}/{self.max_entries}, "
+            f"threshold={self.threshold}, hits={self.hits}, misses={self.misses})"
+        )
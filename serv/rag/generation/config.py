@@ -10,7 +10,6 @@ from typing import Optional
 
 from api.config import settings
 from .base_generator import BaseGenerator
-from .huggingface_generator import HuggingFaceGenerator
 
 
 logger = logging.getLogger(__name__)
@@ -51,12 +50,15 @@ def get_generator() -> BaseGenerator:
     
     # Priority 1: Hugging Face (recommended - free, no card needed)
     if settings.huggingface_api_key:
+        from .huggingface_generator import HuggingFaceGenerator
+        
         logger.info(f"Using Hugging Face generator: {settings.huggingface_model}")
         _generator_instance = HuggingFaceGenerator(
             api_key=settings.huggingface_api_key,
             model=settings.huggingface_model,
             timeout=settings.llm_timeout_seconds,
-            max_retries=settings.llm_max_retries
+            max_retries=settings.llm_max_retries,
+            max_context_tokens=settings.llm_max_context_tokens
         )
         return _generator_instance
     
@@ -93,3 +95,22 @@ def reset_generator() -> None:
     """
     global _generator_instance
     _generator_instance = None
+
+
+async def shutdown_generator() -> None:
+    """
+    Close pooled LLM API connections and reset the generator singleton.
+    
+    Call this during application shutdown (in main.py lifespan).
+    """
+    global _generator_instance
+    
+    if _generator_instance is None:
+        return
+    
+    # Imported here so shutdown doesn't load huggingface_hub when no
+    # generator was ever created
+    from .huggingface_generator import close_clients
+    
+    await close_clients()
+    _generator_instance = None
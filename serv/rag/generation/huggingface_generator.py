@@ -11,18 +11,73 @@ Recommended models:
 """
 
 import asyncio
+import importlib.util
 import logging
-from typing import List, Optional
+import random
+import sys
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Union
 
 from huggingface_hub import AsyncInferenceClient
 from huggingface_hub.utils import HfHubHTTPError
 
+# Only needed for exact context token budgeting; imported lazily in
+# _load_tokenizer so importing the generator doesn't load transformers/torch
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+
 from .base_generator import BaseGenerator, GenerationConfig
+from .cache import ExactCache, SemanticCache, fingerprint
+from .prompts import CONCISE_COACH_PROMPT, format_numbered
 
 
 logger = logging.getLogger(__name__)
 
 
+# Rough chars-per-token ratio used when the model tokenizer is unavailable
+CHARS_PER_TOKEN = 4
+
+# Allowance for each "Document N: " label and separator in the prompt
+DOCUMENT_OVERHEAD_TOKENS = 8
+
+_INSTRUCTION_SUFFIX = sys.intern(
+    "\n\nProvide a helpful, concise answer based on the context above. [/INST]"
+)
+
+
+# Shared clients keyed by API token, so generators reuse one HTTP
+# connection pool (and its keep-alive TLS connections)
+_clients: Dict[str, AsyncInferenceClient] = {}
+
+
+def _get_client(api_key: str) -> AsyncInferenceClient:
+    """
+    Get the shared inference client for an API token, creating it lazily.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        client = AsyncInferenceClient(token=api_key)
+        _clients[api_key] = client
+    return client
+
+
+async def close_clients() -> None:
+    """
+    Close all shared inference clients.
+    
+    Call this during application shutdown (in main.py lifespan).
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        # Older huggingface_hub releases (still allowed by requirements)
+        # have no close(); skip it rather than fail shutdown
+        close = getattr(client, "close", None)
+        if close is not None:
+            await close()
+    if clients:
+        logger.info(f"Closed {len(clients)} HuggingFace inference client(s)")
+
+
 class HuggingFaceGenerator(BaseGenerator):
     """
     Text generation using Hugging Face Inference API.
@@ -55,7 +110,10 @@ class HuggingFaceGenerator(BaseGenerator):
         api_key: str,
         model: str = "mistralai/Mistral-7B-Instruct-v0.2",
         timeout: int = 30,
-        max_retries: int = 2
+        max_retries: int = 2,
+        semantic_cache: Optional[SemanticCache] = None,
+        exact_cache_size: int = 512,
+        max_context_tokens: Optional[int] = None
     ):
         """
         Initialize Hugging Face generator.
@@ -65,14 +123,40 @@ class HuggingFaceGenerator(BaseGenerator):
             model: Model ID on Hugging Face Hub
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
+            semantic_cache: Optional cache that answers near-duplicate
+                            queries over the same context without an API call
+            exact_cache_size: Max responses kept for deterministic
+                              (temperature=0) calls
+            max_context_tokens: Model context window; context documents
+                                are trimmed so the prompt plus the reply
+                                (config.max_tokens) fit (None = no limit)
         """
         self.api_key = api_key
         self.model = model
         self.timeout = timeout
         self.max_retries = max_retries
+        self.semantic_cache = semantic_cache
+        self._exact_cache = ExactCache(max_entries=exact_cache_size)
+        self.max_context_tokens = max_context_tokens
+        
+        # Tokenizer is loaded on first use; per-document token counts are
+        # memoized since the same passages are retrieved turn after turn
+        self._tokenizer = None
+        self._tokenizer_loaded = False
+        self._token_length = lru_cache(maxsize=8192)(self._count_tokens)
         
-        # Initialize official HF client
-        self.client = AsyncInferenceClient(token=api_key)
+        # Capped exponential backoff; the jitter is drawn per sleep (see
+        # _backoff_delay) because the generator is a process-wide singleton
+        self._backoff_caps = [
+            min(20.0, 2.0 ** (attempt + 1))
+            for attempt in range(max_retries + 1)
+        ]
+        
+        # Shared wait while the model cold-loads (single-flight across callers)
+        self._model_loading: Optional[asyncio.Task] = None
+        
+        # Official HF client, shared across generators with the same token
+        self.client = _get_client(api_key)
         
         logger.info(f"Initialized HuggingFace generator with model: {model}")
     
@@ -81,7 +165,8 @@ class HuggingFaceGenerator(BaseGenerator):
         query: str,
         context_documents: List[str],
         system_prompt: Optional[str] = None,
-        config: Optional[GenerationConfig] = None
+        config: Optional[GenerationConfig] = None,
+        cache_context: Optional[List[str]] = None
     ) -> str:
         """
         Generate response using Hugging Face Inference API.
@@ -91,31 +176,305 @@ class HuggingFaceGenerator(BaseGenerator):
             context_documents: Retrieved documents for context
             system_prompt: System instructions (optional)
             config: Generation parameters
+            cache_context: Semantic cache key parts; pass these when
+                           context_documents is a rendered prompt that
+                           already contains the query, or a rephrased
+                           query could never hit
             
         Returns:
             Generated text response
         """
         config = config or GenerationConfig()
+        context_documents = await self._fit_context(
+            context_documents, query, system_prompt, config
+        )
+        
+        # Semantic cache: rephrased query over identical context/settings
+        cache_embedding = None
+        if self.semantic_cache is not None:
+            if cache_context is None:
+                cache_context = [system_prompt or "", *context_documents]
+            context_key = fingerprint(repr(config), *cache_context)
+            cache_embedding = await self.semantic_cache.embed(query)
+            cached = self.semantic_cache.lookup(cache_embedding, context_key)
+            if cached is not None:
+                logger.info(f"Semantic cache hit for query: '{query[:50]}...'")
+                return cached
         
         # Build prompt using inherited method
         prompt = self._format_prompt(query, context_documents, system_prompt)
         
-        logger.info(f"Generating response for query: '{query[:50]}...'")
+        # Fingerprint once: exact-cache key and log correlation id for all retries
+        request_key = fingerprint(self.model, prompt, repr(config))
+        
+        logger.info(
+            f"Generating response for query: '{query[:50]}...' "
+            f"(request={request_key & 0xFFFFFFFF:08x})"
+        )
         logger.debug(f"Prompt length: {len(prompt)} chars")
         
         # Call API with retry logic
-        response_text = await self._call_api_with_retry(prompt, config)
+        response_text = await self._call_api_with_retry(prompt, config, request_key)
+        
+        if cache_embedding is not None:
+            self.semantic_cache.store(cache_embedding, context_key, response_text)
         
         logger.info(f"Generated {len(response_text)} chars")
         return response_text
     
-    async def _call_api_with_retry(self, prompt: str, config: GenerationConfig) -> str:
+    async def generate_batch(
+        self,
+        queries: List[str],
+        contexts: List[List[str]],
+        system_prompt: Optional[str] = None,
+        config: Optional[GenerationConfig] = None,
+        max_concurrency: int = 8
+    ) -> List[Union[str, Exception]]:
+        """
+        Generate responses for several queries concurrently.
+        
+        Requests are fanned out with asyncio.gather, bounded by a semaphore,
+        so N calls cost roughly one round-trip instead of N. TGI-backed
+        endpoints batch concurrent requests server-side (continuous batching).
+        
+        Args:
+            queries: User questions
+            contexts: Context documents for each query (same length as queries)
+            system_prompt: System instructions shared by all queries (optional)
+            config: Generation parameters
+            max_concurrency: Maximum in-flight API calls
+            
+        Returns:
+            One entry per query, in input order: the generated text, or the
+            exception raised for that query (other queries are unaffected)
+        """
+        if len(queries) != len(contexts):
+            raise ValueError(
+                f"Got {len(queries)} queries but {len(contexts)} context lists"
+            )
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(query: str, context_documents: List[str]) -> str:
+            async with semaphore:
+                return await self.generate(query, context_documents, system_prompt, config)
+        
+        logger.info(f"Generating {len(queries)} responses (max_concurrency={max_concurrency})")
+        return await asyncio.gather(
+            *[run(q, c) for q, c in zip(queries, contexts)],
+            return_exceptions=True
+        )
+    
+    async def generate_stream(
+        self,
+        query: str,
+        context_documents: List[str],
+        system_prompt: Optional[str] = None,
+        config: Optional[GenerationConfig] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream response chunks from Hugging Face Inference API.
+        
+        Uses chat_completion(stream=True) so the first tokens reach the caller
+        while the model is still decoding. Only opening the stream is retried
+        (model loading, 503); once chunks have been yielded a retry would
+        duplicate output, so later errors propagate.
+        
+        Args:
+            query: User's question
+            context_documents: Retrieved documents for context
+            system_prompt: System instructions (optional)
+            config: Generation parameters
+            
+        Yields:
+            Text chunks in generation order
+            
+        Raises:
+            RuntimeError: If the API call fails
+        """
+        config = config or GenerationConfig()
+        context_documents = await self._fit_context(
+            context_documents, query, system_prompt, config
+        )
+        prompt = self._format_prompt(query, context_documents, system_prompt)
+        
+        logger.info(f"Streaming response for query: '{query[:50]}...'")
+        
+        total_chars = 0
+        try:
+            stream = await self._open_stream(prompt, config)
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if token:
+                    total_chars += len(token)
+                    yield token
+        
+        except HfHubHTTPError as e:
+            error = f"HuggingFace API error {e.response.status_code}: {str(e)}"
+            logger.error(error)
+            raise RuntimeError(error)
+        
+        logger.info(f"Streamed {total_chars} chars")
+    
+    async def _fit_context(
+        self,
+        context_documents: List[str],
+        query: str,
+        system_prompt: Optional[str],
+        config: GenerationConfig
+    ) -> List[str]:
+        """
+        Keep the highest-ranked documents that fit in the context window.
+        
+        The budget is max_context_tokens minus the reply reserve
+        (config.max_tokens) and the rest of the prompt (system prompt,
+        query, instruction template). Documents are assumed to be in
+        relevance order; the first one that overflows is truncated to the
+        remaining budget and the rest are dropped. A non-empty input never
+        comes back empty - callers that pass a single rendered prompt
+        still get (the start of) it.
+        """
+        if self.max_context_tokens is None or not context_documents:
+            return context_documents
+        
+        if not self._tokenizer_loaded:
+            self._tokenizer = await asyncio.to_thread(self._load_tokenizer)
+            self._tokenizer_loaded = True
+        
+        # Not memoized: the overhead prompt contains the query
+        overhead = self._count_tokens(self._format_prompt(query, [], system_prompt))
+        remaining = self.max_context_tokens - config.max_tokens - overhead
+        
+        for i, doc in enumerate(context_documents):
+            length = self._token_length(doc) + DOCUMENT_OVERHEAD_TOKENS
+            if length <= remaining:
+                remaining -= length
+                continue
+            
+            kept = context_documents[:i]
+            room = remaining - DOCUMENT_OVERHEAD_TOKENS
+            if room > 0:
+                kept.append(self._truncate_tokens(doc, room))
+            elif not kept:
+                # Nothing fits: send the top document rather than an empty
+                # context and let the API reject it if it must
+                logger.warning(
+                    f"Prompt overhead and reply reserve exceed the "
+                    f"{self.max_context_tokens}-token context window"
+                )
+                kept.append(doc)
+            logger.info(
+                f"Context budget of {self.max_context_tokens} tokens reached: "
+                f"keeping {len(kept)}/{len(context_documents)} documents"
+            )
+            return kept
+        return context_documents
+    
+    def _load_tokenizer(self):
+        """
+        Load the model's tokenizer, or None to fall back to a char estimate.
+        """
+        if not TRANSFORMERS_AVAILABLE:
+            return None
+        try:
+            from transformers import AutoTokenizer
+            return AutoTokenizer.from_pretrained(self.model, token=self.api_key)
+        except Exception as e:
+            logger.warning(
+                f"Tokenizer for {self.model} unavailable ({str(e)[:100]}), "
+                f"estimating {CHARS_PER_TOKEN} chars/token"
+            )
+            return None
+    
+    def _count_tokens(self, text: str) -> int:
+        if self._tokenizer is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(self._tokenizer(text, add_special_tokens=False).input_ids)
+    
+    def _truncate_tokens(self, text: str, max_tokens: int) -> str:
+        if self._tokenizer is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+        input_ids = self._tokenizer(text, add_special_tokens=False).input_ids
+        return self._tokenizer.decode(input_ids[:max_tokens])
+    
+    async def _open_stream(self, prompt: str, config: GenerationConfig):
+        """
+        Open a streaming chat completion, retrying while the model loads.
+        
+        Args:
+            prompt: Formatted prompt
+            config: Generation configuration
+            
+        Returns:
+            Async iterator of chat completion chunks
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._wait_if_model_loading()
+            try:
+                return await self.client.chat_completion(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    max_tokens=config.max_tokens,
+                    temperature=config.temperature,
+                    top_p=config.top_p,
+                    frequency_penalty=config.frequency_penalty,
+                    stream=True
+                )
+            except HfHubHTTPError as e:
+                if e.response.status_code != 503 or attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    f"Model loading (attempt {attempt + 1}/{self.max_retries + 1})"
+                )
+                await self._wait_for_model_load(attempt)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Full-jitter delay before retry `attempt`, so concurrent callers
+        that failed together don't retry in lockstep.
+        """
+        return random.uniform(0.0, self._backoff_caps[attempt])
+    
+    async def _wait_for_model_load(self, attempt: int) -> None:
+        """
+        Back off after a 503, sharing one wait across concurrent callers.
+        
+        The first caller to see the model loading starts a backoff timer;
+        callers that hit 503 meanwhile await that same timer instead of
+        each sleeping their own schedule, so all of them retry once the
+        window ends.
+        """
+        if self._model_loading is None or self._model_loading.done():
+            self._model_loading = asyncio.create_task(
+                asyncio.sleep(self._backoff_delay(attempt))
+            )
+        # Shield: a cancelled caller must not cancel the shared wait
+        await asyncio.shield(self._model_loading)
+    
+    async def _wait_if_model_loading(self) -> None:
+        """
+        Hold new requests while another caller is backing off a 503.
+        """
+        if self._model_loading is not None and not self._model_loading.done():
+            await asyncio.shield(self._model_loading)
+    
+    async def _call_api_with_retry(
+        self,
+        prompt: str,
+        config: GenerationConfig,
+        request_key: Optional[int] = None
+    ) -> str:
         """
         Call Hugging Face API with exponential backoff retry.
         
         Args:
             prompt: Formatted prompt
             config: Generation configuration
+            request_key: fingerprint() of model, prompt and config, if the
+                         caller already computed it
             
         Returns:
             Generated text
@@ -123,9 +482,21 @@ class HuggingFaceGenerator(BaseGenerator):
         Raises:
             RuntimeError: If all retries fail
         """
+        # temperature=0 output is a pure function of the request - reuse it
+        cache_key = None
+        if config.temperature == 0:
+            cache_key = request_key
+            if cache_key is None:
+                cache_key = fingerprint(self.model, prompt, repr(config))
+            cached = self._exact_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Exact cache hit for deterministic call")
+                return cached
+        
         last_error = None
         
         for attempt in range(self.max_retries + 1):
+            await self._wait_if_model_loading()
             try:
                 logger.debug(f"API call attempt {attempt + 1}/{self.max_retries + 1}")
                 
@@ -139,41 +510,42 @@ class HuggingFaceGenerator(BaseGenerator):
                     frequency_penalty=config.frequency_penalty
                 )
                 
-                # Extract generated text from response
-                if hasattr(response, 'choices') and len(response.choices) > 0:
-                    return response.choices[0].message.content.strip()
-                elif isinstance(response, str):
-                    return response.strip()
-                else:
-                    raise RuntimeError(f"Unexpected response type: {type(response)}")
+                # chat_completion returns ChatCompletionOutput - index directly
+                try:
+                    text = response.choices[0].message.content.strip()
+                except (AttributeError, IndexError) as e:
+                    raise RuntimeError(
+                        f"Unexpected response shape: {type(response).__name__}"
+                    ) from e
+                
+                if cache_key is not None:
+                    self._exact_cache.put(cache_key, text)
+                return text
             
             except HfHubHTTPError as e:
-                # Handle model loading (503) - retry with backoff
-                if e.response.status_code == 503:
+                last_error = f"HuggingFace API error {e.response.status_code}: {str(e)}"
+                model_loading = e.response.status_code == 503
+                if model_loading:
                     logger.warning(
                         f"Model loading (attempt {attempt + 1}/{self.max_retries + 1})"
                     )
-                    if attempt < self.max_retries:
-                        wait_time = min(20, 2 ** attempt)
-                        await asyncio.sleep(wait_time)
-                        continue
-                
-                # Other HTTP errors
-                last_error = f"HuggingFace API error {e.response.status_code}: {str(e)}"
-                logger.error(last_error)
+                else:
+                    logger.error(last_error)
                 
                 if attempt < self.max_retries:
-                    await asyncio.sleep(2 ** attempt)
+                    if model_loading:
+                        await self._wait_for_model_load(attempt)
+                    else:
+                        await asyncio.sleep(self._backoff_delay(attempt))
                     continue
-                else:
-                    raise RuntimeError(last_error)
+                raise RuntimeError(last_error)
             
             except asyncio.TimeoutError:
                 last_error = f"Request timeout after {self.timeout}s"
                 logger.warning(f"{last_error} (attempt {attempt + 1}/{self.max_retries + 1})")
                 
                 if attempt < self.max_retries:
-                    await asyncio.sleep(2 ** attempt)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
             
             except Exception as e:
@@ -201,27 +573,14 @@ class HuggingFaceGenerator(BaseGenerator):
         Question: {query} [/INST]
         """
         # Build context section
-        context_text = "\n\n".join(
-            f"Document {i+1}: {doc}" 
-            for i, doc in enumerate(context_documents)
-        )
+        context_text = format_numbered("Document", context_documents)
         
-        # Default system prompt for FocusGuard
-        if not system_prompt:
-            system_prompt = (
-                "You are a focus and productivity coach. "
-                "Provide concise, actionable advice based on the context provided. "
-                "Be empathetic and encouraging."
-            )
+        system_prompt = system_prompt or CONCISE_COACH_PROMPT
         
         # Format in instruction style (works for Mistral, Llama, Zephyr)
-        prompt = f"""[INST] {system_prompt}
-
-Context:
-{context_text}
-
-Question: {query}
-
-Provide a helpful, concise answer based on the context above. [/INST]"""
-        
-        return prompt
+        return "".join([
+            "[INST] ", system_prompt,
+            "\n\nContext:\n", context_text,
+            "\n\nQuestion: ", query,
+            _INSTRUCTION_SUFFIX,
+        ])
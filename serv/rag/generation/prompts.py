@@ -2,9 +2,18 @@
 Prompt Templates for FocusGuard RAG
 
 Curated system prompts and prompt building utilities for productivity coaching.
+
+Pure stdlib and fully typed, so it can optionally be compiled with mypyc
+(`mypyc rag/generation/prompts.py` from serv/); the compiled extension
+takes precedence over the .py when importing.
 """
 
-from typing import List
+import random
+import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 
 # ============================================================================
@@ -110,6 +119,163 @@ Guidelines:
 """
 
 
+# Short persona used as the generator default when no system prompt is given
+CONCISE_COACH_PROMPT = (
+    "You are a focus and productivity coach. "
+    "Provide concise, actionable advice based on the context provided. "
+    "Be empathetic and encouraging."
+)
+
+
+# Intern the personas so equal prompts share one object and dict/LRU
+# cache lookups keyed on them short-circuit on identity
+PRODUCTIVITY_COACH_PROMPT = sys.intern(PRODUCTIVITY_COACH_PROMPT)
+DISTRACTION_ANALYSIS_PROMPT = sys.intern(DISTRACTION_ANALYSIS_PROMPT)
+MOTIVATION_PROMPT = sys.intern(MOTIVATION_PROMPT)
+STATS_ANALYSIS_PROMPT = sys.intern(STATS_ANALYSIS_PROMPT)
+CONCISE_COACH_PROMPT = sys.intern(CONCISE_COACH_PROMPT)
+
+
+# ============================================================================
+# Canned Responses
+# ============================================================================
+
+# Bare greetings that don't need retrieval or an LLM round-trip
+_GREETING_RE = re.compile(
+    r"^\s*(hi+|hello+|hey+|yo|sup|hiya|howdy|good (morning|afternoon|evening))"
+    r"( there| alex)?[\s!.?]*$",
+    re.IGNORECASE
+)
+
+GREETING_RESPONSES = (
+    "Hey there! 👋 I'm Alex, your focus coach. What's on your mind today?",
+    "Hi! 👋 I'm Alex, your focus coach. What would you like to work on today?",
+    "Hello! ✨ I'm Alex, here to help you build better focus habits. How can I help?",
+)
+
+
+def match_greeting(query: str) -> Optional[str]:
+    """
+    Return a canned reply if the query is just a greeting.
+    
+    Args:
+        query: Raw user message
+        
+    Returns:
+        Greeting response, or None if the query needs the full pipeline
+    """
+    if _GREETING_RE.match(query):
+        return random.choice(GREETING_RESPONSES)
+    return None
+
+
+# ============================================================================
+# Static Prompt Sections
+# ============================================================================
+
+# Section headers that follow the system prompt in each builder
+_RAG_CONTEXT_HEADER = "\n\nContext Documents:\n"
+_STATS_HEADER = "\n\n"
+_CONVERSATION_HEADER = "\n"
+
+_RAG_SUFFIX = "\n\nProvide a helpful, concise answer based on the context above."
+
+_SESSION_SUMMARY_TASK = (
+    "\n\nTask: Provide a brief, encouraging summary of this session with 2-3 specific "
+    "recommendations \nfor the next session based on the tips above. Keep it under 100 words."
+)
+
+_PROGRESS_ANALYSIS_TASK = (
+    "\n\nTask: Provide a brief weekly summary highlighting progress toward goals and "
+    "suggest \none key strategy from the knowledge base to try next week. "
+    "Be specific and encouraging."
+)
+
+_STATS_ANALYSIS_TASK = (
+    "\n\nProvide a data-driven analysis with specific insights based on their stats. "
+    "Be encouraging and actionable."
+)
+
+_CONVERSATION_TASK = (
+    "\n\nRespond naturally, considering the conversation history above. Reference "
+    "previous messages when relevant (e.g., \"As we discussed earlier...\" or "
+    "\"Building on what I suggested...\"). Keep your response conversational and helpful."
+)
+
+
+@lru_cache(maxsize=32)
+def _prompt_prefix(system_prompt: str, header: str) -> str:
+    """
+    Memoized `system_prompt + header`.
+    
+    The system prompts are multi-KB constants, so every request would
+    otherwise re-copy the same leading bytes. Built-in prompts are
+    materialized below at import; custom ones are cached on first use.
+    """
+    return system_prompt + header
+
+
+@lru_cache(maxsize=16)
+def _numbered_formatter(label: str) -> Callable[..., str]:
+    # Bound str.format for "<label> N: text", built once per label
+    return (label + " {}: {}").format
+
+
+def format_numbered(label: str, documents: List[str]) -> str:
+    """
+    Join documents as "<label> 1: ...", "<label> 2: ..." separated by blank lines.
+    
+    Uses a single join over map(str.format) - no generator frame or
+    per-item f-string evaluation.
+    
+    Args:
+        label: Item label, e.g. "Document" or "Tip"
+        documents: Document texts
+        
+    Returns:
+        Numbered context section
+    """
+    return "\n\n".join(
+        map(_numbered_formatter(label), range(1, len(documents) + 1), documents)
+    )
+
+
+# Shared read-only fallback for missing nested stats dicts
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+# Number of most recent messages included in conversation-aware prompts
+HISTORY_WINDOW = 6
+
+
+@lru_cache(maxsize=1024)
+def _history_line(role: str, content: str) -> str:
+    role_label = "User" if role == "user" else "You (Alex)"
+    return f"{role_label}: {content}"
+
+
+@lru_cache(maxsize=256)
+def _render_history(messages: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Render the "Previous Conversation" section, memoized by content.
+    
+    History is reloaded from the database on every turn, so caching is
+    keyed on the (role, content) pairs rather than the list object. As the
+    window slides, only the newest messages are formatted; earlier lines
+    come from the per-message cache.
+    """
+    return "".join([
+        "\n\nPrevious Conversation:\n",
+        "\n".join([_history_line(role, content) for role, content in messages]),
+        "\n",
+    ])
+
+
+_prompt_prefix(PRODUCTIVITY_COACH_PROMPT, _RAG_CONTEXT_HEADER)
+_prompt_prefix(PRODUCTIVITY_COACH_PROMPT, _CONVERSATION_HEADER)
+_prompt_prefix(STATS_ANALYSIS_PROMPT, _STATS_HEADER)
+
+
 # ============================================================================
 # Prompt Builders
 # ============================================================================
@@ -142,26 +308,20 @@ def build_rag_prompt(
         ```
     """
     # Format context documents
-    context_text = "\n\n".join(
-        f"Document {i+1}: {doc}" 
-        for i, doc in enumerate(context_documents)
-    )
+    context_text = format_numbered("Document", context_documents)
     
-    # Build final prompt
-    prompt = f"""{system_prompt}
-
-Context Documents:
-{context_text}
-
-User Question: {query}
-
-Provide a helpful, concise answer based on the context above."""
-    
-    return prompt
+    # Build final prompt (static prefix/suffix are precomputed)
+    return "".join([
+        _prompt_prefix(system_prompt, _RAG_CONTEXT_HEADER),
+        context_text,
+        "\n\nUser Question: ",
+        query,
+        _RAG_SUFFIX,
+    ])
 
 
 def build_session_summary_prompt(
-    session_data: dict,
+    session_data: Dict[str, Any],
     context_tips: List[str]
 ) -> str:
     """
@@ -178,27 +338,22 @@ def build_session_summary_prompt(
     distractions = session_data.get('distractions', [])
     blink_rate = session_data.get('blink_rate', 'N/A')
     
-    tips_text = "\n".join(f"- {tip}" for tip in context_tips)
+    tips_text = "\n".join(map("- {}".format, context_tips))
     
-    prompt = f"""You are analyzing a completed focus session in FocusGuard.
-
-Session Stats:
-- Duration: {duration_mins:.1f} minutes
-- Distractions detected: {len(distractions)}
-- Blink rate: {blink_rate} blinks/min
-- Top distractions: {', '.join(d.get('type', 'unknown') for d in distractions[:3])}
-
-Relevant Productivity Tips:
-{tips_text}
-
-Task: Provide a brief, encouraging summary of this session with 2-3 specific recommendations 
-for the next session based on the tips above. Keep it under 100 words."""
-    
-    return prompt
+    return "".join([
+        "You are analyzing a completed focus session in FocusGuard.\n\n"
+        "Session Stats:\n- Duration: ", f"{duration_mins:.1f}",
+        " minutes\n- Distractions detected: ", str(len(distractions)),
+        "\n- Blink rate: ", str(blink_rate),
+        " blinks/min\n- Top distractions: ",
+        ", ".join([d.get('type', 'unknown') for d in distractions[:3]]),
+        "\n\nRelevant Productivity Tips:\n", tips_text,
+        _SESSION_SUMMARY_TASK,
+    ])
 
 
 def build_progress_analysis_prompt(
-    weekly_stats: dict,
+    weekly_stats: Dict[str, Any],
     goals: List[str],
     context_strategies: List[str]
 ) -> str:
@@ -217,32 +372,24 @@ def build_progress_analysis_prompt(
     avg_duration = weekly_stats.get('avg_duration', 0) / 60
     total_minutes = weekly_stats.get('total_minutes', 0)
     
-    goals_text = "\n".join(f"- {goal}" for goal in goals)
-    strategies_text = "\n".join(f"- {strategy}" for strategy in context_strategies)
-    
-    prompt = f"""You are providing a weekly productivity report for a FocusGuard user.
-
-This Week's Stats:
-- Total sessions: {total_sessions}
-- Total focus time: {total_minutes:.0f} minutes
-- Average session: {avg_duration:.1f} minutes
-
-User's Goals:
-{goals_text}
-
-Relevant Strategies from Knowledge Base:
-{strategies_text}
-
-Task: Provide a brief weekly summary highlighting progress toward goals and suggest 
-one key strategy from the knowledge base to try next week. Be specific and encouraging."""
+    goals_text = "\n".join(map("- {}".format, goals))
+    strategies_text = "\n".join(map("- {}".format, context_strategies))
     
-    return prompt
+    return "".join([
+        "You are providing a weekly productivity report for a FocusGuard user.\n\n"
+        "This Week's Stats:\n- Total sessions: ", str(total_sessions),
+        "\n- Total focus time: ", f"{total_minutes:.0f}",
+        " minutes\n- Average session: ", f"{avg_duration:.1f}",
+        " minutes\n\nUser's Goals:\n", goals_text,
+        "\n\nRelevant Strategies from Knowledge Base:\n", strategies_text,
+        _PROGRESS_ANALYSIS_TASK,
+    ])
 
 
 def build_stats_analysis_prompt(
     query: str,
-    user_stats: dict,
-    context_documents: List[str] = None
+    user_stats: Dict[str, Any],
+    context_documents: Optional[List[str]] = None
 ) -> str:
     """
     Build prompt for analyzing user statistics and trends.
@@ -255,6 +402,9 @@ def build_stats_analysis_prompt(
     Returns:
         Formatted prompt for stats analysis
     """
+    last_7_days = user_stats.get('last_7_days') or _EMPTY
+    avg_blink_rate = last_7_days.get('avg_blink_rate')
+    
     # Format user stats
     stats_text = f"""User Profile:
 - Username: {user_stats.get('username', 'User')}
@@ -270,40 +420,38 @@ Overall Performance:
 - Total Focus Time: {user_stats.get('total_focus_minutes', 0)} minutes
 
 Last 7 Days:
-- Sessions Started: {user_stats.get('last_7_days', {}).get('sessions_count', 0)}
-- Sessions Completed: {user_stats.get('last_7_days', {}).get('completed_count', 0)}
-- Focus Minutes: {user_stats.get('last_7_days', {}).get('focus_minutes', 0)}
+- Sessions Started: {last_7_days.get('sessions_count', 0)}
+- Sessions Completed: {last_7_days.get('completed_count', 0)}
+- Focus Minutes: {last_7_days.get('focus_minutes', 0)}
 """
     
-    if user_stats.get('last_7_days', {}).get('avg_blink_rate'):
-        stats_text += f"- Avg Blink Rate: {user_stats['last_7_days']['avg_blink_rate']} blinks/min (indicator of screen focus)\n"
+    if avg_blink_rate:
+        stats_text += f"- Avg Blink Rate: {avg_blink_rate} blinks/min (indicator of screen focus)\n"
     
     # Add context documents if available
     context_section = ""
     if context_documents:
-        context_text = "\n\n".join(f"Tip {i+1}: {doc}" for i, doc in enumerate(context_documents))
-        context_section = f"""
-
-Relevant Productivity Tips:
-{context_text}
-"""
-    
-    prompt = f"""{STATS_ANALYSIS_PROMPT}
-
-{stats_text}
-{context_section}
-
-User Question: {query}
-
-Provide a data-driven analysis with specific insights based on their stats. Be encouraging and actionable."""
+        context_section = "".join([
+            "\n\nRelevant Productivity Tips:\n",
+            format_numbered("Tip", context_documents),
+            "\n",
+        ])
     
-    return prompt
+    return "".join([
+        _prompt_prefix(STATS_ANALYSIS_PROMPT, _STATS_HEADER),
+        stats_text,
+        "\n",
+        context_section,
+        "\n\nUser Question: ",
+        query,
+        _STATS_ANALYSIS_TASK,
+    ])
 
 
 def build_conversation_aware_prompt(
     query: str,
     context_documents: List[str],
-    conversation_history: List[dict] = None,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
     system_prompt: str = PRODUCTIVITY_COACH_PROMPT
 ) -> str:
     """
@@ -331,35 +479,24 @@ def build_conversation_aware_prompt(
         ```
     """
     # Format context documents
-    context_text = "\n\n".join(
-        f"Knowledge Base Excerpt {i+1}: {doc}" 
-        for i, doc in enumerate(context_documents)
-    )
+    context_text = format_numbered("Knowledge Base Excerpt", context_documents)
     
     # Format conversation history if available
     history_text = ""
-    if conversation_history and len(conversation_history) > 0:
-        history_items = []
-        for msg in conversation_history[-6:]:  # Last 6 messages for context
-            role_label = "User" if msg["role"] == "user" else "You (Alex)"
-            history_items.append(f"{role_label}: {msg['content']}")
-        
-        history_text = f"""
-
-Previous Conversation:
-{chr(10).join(history_items)}
-"""
+    if conversation_history:
+        window = conversation_history[-HISTORY_WINDOW:]
+        history_text = _render_history(
+            tuple((msg["role"], msg["content"]) for msg in window)
+        )
     
     # Build final prompt
-    prompt = f"""{system_prompt}
-{history_text}
-
-Knowledge Base Context:
-{context_text}
-
-Current User Message: {query}
-
-Respond naturally, considering the conversation history above. Reference previous messages when relevant (e.g., "As we discussed earlier..." or "Building on what I suggested..."). Keep your response conversational and helpful."""
-    
-    return prompt
+    return "".join([
+        _prompt_prefix(system_prompt, _CONVERSATION_HEADER),
+        history_text,
+        "\n\nKnowledge Base Context:\n",
+        context_text,
+        "\n\nCurrent User Message: ",
+        query,
+        _CONVERSATION_TASK,
+    ])
 
@@ -12,42 +12,173 @@ import asyncio
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
-import yaml
 
+from api.config import settings
 from rag.embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
 from rag.vector_store.qdrant_store import QdrantVectorStore
-from rag.vector_store.base_store import Document
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+_SECTION_RE = re.compile(r'\n## ')
+
+# Parallel (ids, contents, metadatas) columns for a set of chunks. Kept as
+# plain lists instead of Document objects all the way to the Qdrant upload
+ChunkColumns = Tuple[List[str], List[str], List[Dict[str, Any]]]
+
+
+# Frontmatter the fast path understands: `key: value` with a bare key
+_FRONTMATTER_LINE_RE = re.compile(r'([A-Za-z_][\w-]*):(?:\s+(.*))?')
+
+# Bare scalars YAML resolves to plain strings: start with a letter and use
+# no indicator/comment characters. Anything else goes to the YAML parser
+_PLAIN_STRING_RE = re.compile(r'[A-Za-z][\w ./-]*')
+_INT_RE = re.compile(r'-?(?:0|[1-9][0-9]*)')
+
+# YAML 1.1 (PyYAML) spellings of booleans and null
+_YAML_BOOLS = {
+    'true': True, 'True': True, 'TRUE': True,
+    'false': False, 'False': False, 'FALSE': False,
+    'yes': True, 'Yes': True, 'YES': True,
+    'no': False, 'No': False, 'NO': False,
+    'on': True, 'On': True, 'ON': True,
+    'off': False, 'Off': False, 'OFF': False,
+}
+_YAML_NULLS = {'', '~', 'null', 'Null', 'NULL'}
+
+
+def _parse_scalar(value: str) -> Any:
+    """
+    Convert a plain YAML scalar (int, bool, null, bare string).
+    
+    Raises:
+        ValueError: For quoted strings, floats, dates or any other value
+                    whose YAML interpretation this parser doesn't replicate
+    """
+    if value in _YAML_NULLS:
+        return None
+    if value in _YAML_BOOLS:
+        return _YAML_BOOLS[value]
+    if _INT_RE.fullmatch(value):
+        return int(value)
+    if _PLAIN_STRING_RE.fullmatch(value):
+        return value
+    raise ValueError(f"Unsupported frontmatter value: {value!r}")
+
+
+def _parse_simple_frontmatter(text: str) -> Dict[str, Any]:
+    """
+    Parse flat `key: value` / `key: [a, b]` frontmatter without PyYAML.
+    
+    Covers the knowledge base schema (category, difficulty, tags).
+    
+    Raises:
+        ValueError: For anything else (nesting, block lists, multi-line or
+                    quoted values, floats, dates) so the caller can fall
+                    back to a full YAML parser
+    """
+    frontmatter = {}
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        
+        match = _FRONTMATTER_LINE_RE.fullmatch(line.rstrip())
+        if match is None:
+            raise ValueError(f"Unsupported frontmatter line: {line!r}")
+        key, value = match.group(1), (match.group(2) or '').strip()
+        if key in _YAML_BOOLS or key in _YAML_NULLS:
+            raise ValueError(f"Unsupported frontmatter key: {key!r}")
+        
+        if value.startswith('[') and value.endswith(']'):
+            inner = value[1:-1].strip()
+            items = [item.strip() for item in inner.split(',')] if inner else []
+            if '' in items:
+                raise ValueError(f"Unsupported frontmatter line: {line!r}")
+            # Items are limited to plain scalars, so a quoted item containing
+            # a comma can't be split in the wrong place
+            frontmatter[key] = [_parse_scalar(item) for item in items]
+        else:
+            frontmatter[key] = _parse_scalar(value)
+    
+    return frontmatter
+
+
+def _leaf_exceptions(group: BaseExceptionGroup) -> List[BaseException]:
+    """
+    Flatten a (possibly nested) exception group into its leaf exceptions.
+    """
+    leaves = []
+    for error in group.exceptions:
+        if isinstance(error, BaseExceptionGroup):
+            leaves.extend(_leaf_exceptions(error))
+        else:
+            leaves.append(error)
+    return leaves
+
+
 class KnowledgeBaseIngester:
     """Handles ingestion of markdown files into vector store."""
     
-    def __init__(self, knowledge_base_dir: str, collection_name: str = "focusguard_knowledge"):
+    # Chunks per SentenceTransformer forward pass during bulk ingestion
+    EMBED_BATCH_SIZE = 64
+    
+    # Chunks embedded together before being handed to an upload task
+    GROUP_SIZE = 256
+    
+    # Max in-flight upserts (bounded to limit Qdrant WAL pressure)
+    UPLOAD_CONCURRENCY = 4
+    
+    # Bound on items waiting between pipeline stages (parse -> embed -> upload)
+    QUEUE_SIZE = 8
+    
+    def __init__(self, knowledge_base_dir: str, collection_name: Optional[str] = None):
         self.knowledge_base_dir = Path(knowledge_base_dir)
-        self.collection_name = collection_name
-        self.embedder = SentenceTransformerEmbedder()
+        self.collection_name = collection_name or settings.qdrant_collection_name
+        # Same model variant as RAGService so ingested and query vectors come
+        # from the same INT8 ONNX, fp16 or fp32 model.
+        # Chunk embeddings survive across runs; only changed chunks are re-embedded
+        self.embedder = SentenceTransformerEmbedder(
+            model_name=settings.sentence_transformer_model,
+            device=settings.sentence_transformer_device,
+            batch_size=self.EMBED_BATCH_SIZE,
+            quantized=settings.sentence_transformer_quantized,
+            num_threads=settings.sentence_transformer_threads,
+            fp16=settings.sentence_transformer_fp16,
+            cache_path=self.knowledge_base_dir / ".embedding_cache.sqlite"
+        )
         self.vector_store = None
         
+        # Points per Qdrant upsert request (QDRANT_UPLOAD_BATCH_SIZE)
+        self.upload_batch_size = settings.qdrant_upload_batch_size
+        
     async def initialize(self):
         """Initialize embedder and vector store."""
         logger.info("Initializing embedder...")
         # SentenceTransformerEmbedder initializes in __init__, no async needed
         
         logger.info("Initializing Qdrant vector store...")
+        # Same settings as RAGService: whichever process creates the
+        # collection first decides its quantization and on-disk layout
         self.vector_store = QdrantVectorStore(
-            url="http://localhost:6333",
+            url=settings.qdrant_url,
             collection_name=self.collection_name,
-            vector_size=self.embedder.dimension
+            vector_size=self.embedder.dimension,
+            api_key=settings.qdrant_api_key or None,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port,
+            scalar_quantization=settings.qdrant_scalar_quantization,
+            on_disk_vectors=settings.qdrant_on_disk_vectors,
+            on_disk_payload=settings.qdrant_on_disk_payload,
+            float16_vectors=settings.qdrant_float16_vectors
         )
         await self.vector_store.initialize()
         
-    def parse_markdown_file(self, file_path: Path) -> Dict[str, Any]:
+    @staticmethod
+    def parse_markdown_file(file_path: Path) -> Dict[str, Any]:
         """
         Parse markdown file with YAML frontmatter.
         
@@ -65,10 +196,16 @@ class KnowledgeBaseIngester:
             parts = content.split('---', 2)
             if len(parts) >= 3:
                 try:
-                    frontmatter = yaml.safe_load(parts[1]) or {}
+                    frontmatter = _parse_simple_frontmatter(parts[1])
                     body = parts[2].strip()
-                except yaml.YAMLError as e:
-                    logger.warning(f"Failed to parse YAML in {file_path.name}: {e}")
+                except ValueError:
+                    # Not flat key/value frontmatter - use the full parser
+                    import yaml
+                    try:
+                        frontmatter = yaml.safe_load(parts[1]) or {}
+                        body = parts[2].strip()
+                    except yaml.YAMLError as e:
+                        logger.warning(f"Failed to parse YAML in {file_path.name}: {e}")
         
         return {
             'frontmatter': frontmatter,
@@ -76,14 +213,15 @@ class KnowledgeBaseIngester:
             'filename': file_path.name
         }
     
-    def chunk_by_sections(self, content: str, filename: str) -> List[str]:
+    @staticmethod
+    def chunk_by_sections(content: str, filename: str) -> List[str]:
         """
         Split markdown content by ## headers (sections).
         
         Each chunk includes the section header and content.
         """
         # Split by ## headers (but not # main header)
-        sections = re.split(r'\n## ', content)
+        sections = _SECTION_RE.split(content)
         
         chunks = []
         main_title = ""
@@ -118,53 +256,130 @@ class KnowledgeBaseIngester:
         logger.debug(f"{filename}: Split into {len(chunks)} chunks")
         return chunks
     
-    async def ingest_file(self, file_path: Path):
-        """Ingest a single markdown file into vector store."""
-        logger.info(f"Processing {file_path.name}...")
-        
+    @staticmethod
+    def prepare_chunks(file_path: Path) -> ChunkColumns:
+        """
+        Parse and chunk a markdown file into id/content/metadata columns (no embedding).
+        """
         # Parse file
-        parsed = self.parse_markdown_file(file_path)
+        parsed = KnowledgeBaseIngester.parse_markdown_file(file_path)
         frontmatter = parsed['frontmatter']
         content = parsed['content']
         
         # Chunk content by sections
-        chunks = self.chunk_by_sections(content, file_path.name)
+        chunks = KnowledgeBaseIngester.chunk_by_sections(content, file_path.name)
         
         if not chunks:
             logger.warning(f"No chunks generated from {file_path.name}")
-            return
+            return [], [], []
         
-        # Create documents
-        documents = []
-        for i, chunk in enumerate(chunks):
-            # Extract section title for better metadata
-            section_title = chunk.split('\n')[0].replace('#', '').strip()
-            
-            metadata = {
+        # Unique ID from source + chunk_index
+        ids = [f"{file_path.stem}_{i}" for i in range(len(chunks))]
+        metadatas = [
+            {
                 'source': file_path.name,
                 'chunk_index': i,
-                'section_title': section_title,
+                # Section title for better metadata
+                'section_title': chunk.split('\n', 1)[0].replace('#', '').strip(),
                 **frontmatter  # Include category, difficulty, tags
             }
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        return ids, chunks, metadatas
+    
+    async def ingest_chunks(self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]):
+        """
+        Embed and upsert chunk columns, overlapping embedding with uploads.
+        
+        Runs the embed and upload stages of the ingestion pipeline on an
+        already parsed set of chunks.
+        """
+        if not ids:
+            return
+        
+        logger.info(f"Generating embeddings for {len(ids)} chunks...")
+        parsed_q: asyncio.Queue = asyncio.Queue()
+        parsed_q.put_nowait((ids, contents, metadatas))
+        parsed_q.put_nowait(None)
+        await self._run_pipeline(parsed_q)
+    
+    async def _run_pipeline(self, parsed_q: asyncio.Queue, *producers) -> None:
+        """
+        Run producer coroutines alongside the embed and upload stages.
+        
+        Stages talk through bounded queues with None sentinels, so parsing,
+        embedding and uploading overlap instead of running back to back.
+        If any stage fails the others are cancelled (TaskGroup).
+        """
+        upload_q: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        try:
+            async with asyncio.TaskGroup() as tasks:
+                for producer in producers:
+                    tasks.create_task(producer)
+                tasks.create_task(self._embed_stage(parsed_q, upload_q))
+                for _ in range(self.UPLOAD_CONCURRENCY):
+                    tasks.create_task(self._upload_stage(upload_q))
+        except ExceptionGroup as group:
+            # Log every stage failure, then surface the first original
+            # error rather than the wrapper
+            errors = _leaf_exceptions(group)
+            for error in errors:
+                logger.error(
+                    f"Ingestion stage failed: {error!r}",
+                    exc_info=(type(error), error, error.__traceback__),
+                )
+            raise errors[0] from group
+    
+    async def _embed_stage(self, parsed_q: asyncio.Queue, upload_q: asyncio.Queue) -> None:
+        """
+        Regroup parsed chunk columns into GROUP_SIZE groups and embed them.
+        
+        Groups span file boundaries so every embedding call gets several
+        full batches instead of a handful of chunks per file.
+        """
+        ids, contents, metadatas = [], [], []
+        done = False
+        while not done:
+            columns = await parsed_q.get()
+            if columns is None:
+                done = True
+            else:
+                ids.extend(columns[0])
+                contents.extend(columns[1])
+                metadatas.extend(columns[2])
             
-            # Generate unique ID from source + chunk_index
-            doc_id = f"{file_path.stem}_{i}"
-            
-            doc = Document(
-                id=doc_id,
-                content=chunk,
-                metadata=metadata
-            )
-            documents.append(doc)
+            while len(ids) >= self.GROUP_SIZE or (done and ids):
+                group = (ids[:self.GROUP_SIZE], contents[:self.GROUP_SIZE], metadatas[:self.GROUP_SIZE])
+                del ids[:self.GROUP_SIZE], contents[:self.GROUP_SIZE], metadatas[:self.GROUP_SIZE]
+                embeddings = await self.embedder.embed_batch(group[1], return_numpy=True)
+                await upload_q.put((*group, embeddings))
         
-        # Add to vector store
-        # Generate embeddings for all chunks
-        logger.debug(f"Generating embeddings for {len(documents)} chunks...")
-        texts = [doc.content for doc in documents]
-        embeddings = await self.embedder.embed_batch(texts)
+        # One sentinel per upload worker
+        for _ in range(self.UPLOAD_CONCURRENCY):
+            await upload_q.put(None)
+    
+    async def _upload_stage(self, upload_q: asyncio.Queue) -> None:
+        """Upsert embedded groups until the end-of-stream sentinel arrives."""
+        while (item := await upload_q.get()) is not None:
+            group_ids, group_contents, group_metadatas, embeddings = item
+            await self.vector_store.upload_columns(
+                group_ids,
+                group_contents,
+                group_metadatas,
+                embeddings,
+                batch_size=self.upload_batch_size
+            )
+    
+    async def ingest_file(self, file_path: Path):
+        """Ingest a single markdown file into vector store."""
+        logger.info(f"Processing {file_path.name}...")
         
-        await self.vector_store.add_documents(documents, embeddings)
-        logger.info(f"✅ Ingested {file_path.name}: {len(chunks)} chunks")
+        # File read + parsing would block the event loop; run them in a thread
+        ids, contents, metadatas = await asyncio.to_thread(self.prepare_chunks, file_path)
+        await self.ingest_chunks(ids, contents, metadatas)
+        if ids:
+            logger.info(f"✅ Ingested {file_path.name}: {len(ids)} chunks")
     
     async def ingest_all(self):
         """Ingest all markdown files from knowledge base directory."""
@@ -180,9 +395,24 @@ class KnowledgeBaseIngester:
         
         logger.info(f"Found {len(md_files)} markdown files to ingest")
         
-        # Ingest each file
-        for file_path in sorted(md_files):
-            await self.ingest_file(file_path)
+        # Files are parsed in a thread (file reads would block the event
+        # loop) and stream into the embed stage while later files are
+        # still being parsed and earlier groups uploaded. A handful of small
+        # files isn't worth a process pool, and forking after torch has
+        # started its thread pools can deadlock
+        md_files = sorted(md_files)
+        parsed_q: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        
+        async def parse_files():
+            for file_path in md_files:
+                columns = await asyncio.to_thread(self.prepare_chunks, file_path)
+                logger.info(f"Prepared {file_path.name}: {len(columns[0])} chunks")
+                await parsed_q.put(columns)
+            await parsed_q.put(None)
+        
+        # Build the HNSW graph once at the end instead of on every upsert
+        async with self.vector_store.bulk_load():
+            await self._run_pipeline(parsed_q, parse_files())
         
         # Get collection stats
         info = await self.vector_store.get_collection_info()
@@ -207,10 +437,7 @@ async def main():
     logger.info(f"Starting knowledge base ingestion from: {knowledge_base_dir}")
     
     # Create ingester
-    ingester = KnowledgeBaseIngester(
-        knowledge_base_dir=str(knowledge_base_dir),
-        collection_name="focusguard_knowledge"
-    )
+    ingester = KnowledgeBaseIngester(knowledge_base_dir=str(knowledge_base_dir))
     
     # Initialize
     await ingester.initialize()
@@ -222,4 +449,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to the stock loop (e.g. Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
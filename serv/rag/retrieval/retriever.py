@@ -4,17 +4,23 @@ Main retrieval logic for RAG pipeline.
 Handles query embedding, vector search, and result filtering for FocusGuard's RAG system.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
 import re
 
 from rag.embeddings.base_embedder import BaseEmbedder
+from rag.cache import ExactCache, fingerprint
 from rag.vector_store.base_store import BaseVectorStore, SearchResult
 
 
 logger = logging.getLogger(__name__)
 
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1F\x7F]')
+
+
 class Retriever:
     """
     Handles the retrieval phase of RAG.
@@ -40,12 +46,25 @@ class Retriever:
         )
     """
     
+    # Frequent FocusGuard questions, prefetched by warmup() at startup
+    WARMUP_QUERIES = [
+        "How can I improve my focus?",
+        "How do I reduce distractions?",
+        "How does the Pomodoro technique work?",
+        "How do I stop checking my phone?",
+        "How long should my focus sessions be?",
+        "How do I stay motivated to study?",
+    ]
+    
     def __init__(
         self,
         embedder: BaseEmbedder,
         vector_store: BaseVectorStore,
         enable_preprocessing: bool = True,
         min_score_threshold: float = 0.0,
+        query_cache_size: int = 1024,
+        batch_window_ms: float = 0.0,
+        max_batch: int = 32,
     ):
         """
         Initialize retriever with embedding model and vector store.
@@ -55,12 +74,27 @@ class Retriever:
             vector_store: Instance of BaseVectorStore for searching
             enable_preprocessing: Whether to clean/normalize queries
             min_score_threshold: Minimum similarity score to include results (0.0 - 1.0)
+            query_cache_size: Max memoized query embeddings (LRU, keyed by processed query)
+            batch_window_ms: Coalesce concurrent searches arriving within this
+                             window into one search_batch() call (0 = off)
+            max_batch: Flush a coalesced batch as soon as it has this many queries
         """
         self.embedder = embedder
         self.vector_store = vector_store
         self.enable_preprocessing = enable_preprocessing
         self.min_score_threshold = min_score_threshold
         
+        # Processed query -> embedding, so retries and repeated questions
+        # skip the embedding forward pass
+        self._query_cache = ExactCache(max_entries=query_cache_size)
+        
+        # Pending coalesced searches, grouped by (top_k, filter)
+        self.batch_window_ms = batch_window_ms
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[int, str], List[Tuple[List[float], asyncio.Future]]] = {}
+        self._batch_tasks: set = set()  # Strong refs so in-flight flushes aren't GC'd
+        self._flush_timers: Dict[Tuple[int, str], asyncio.Task] = {}
+        
         logger.info(
             f"Initialized Retriever: preprocessing={enable_preprocessing}, "
             f"min_score={min_score_threshold}"
@@ -102,31 +136,240 @@ class Retriever:
         """
         logger.info(f"Retrieving documents for query: '{query[:50]}...'")
         
+        # Steps 1-4: Preprocess, embed, filter, search
+        results = await self._embed_and_search(query, top_k, context, filter_metadata)
+        
+        # Step 5: Post-process (filter by score, deduplicate)
+        filtered_results = self._post_process(results)
+        
+        logger.info(f"Returning {len(filtered_results)} documents after filtering")
+        return filtered_results
+    
+    async def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        context: Optional[Dict[str, Any]] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Retrieve documents for several queries that share filters.
+        
+        Uncached queries are embedded in one batch and all searches go to
+        the vector store as a single batch request.
+        
+        Args:
+            queries: User questions
+            top_k: Number of documents per query
+            context: Optional user context for filtering (shared)
+            filter_metadata: Direct metadata filter (shared)
+        
+        Returns:
+            One list of SearchResult objects per query, in input order
+        """
+        if not queries:
+            return []
+        
+        processed = [
+            self._preprocess_query(query) if self.enable_preprocessing else query
+            for query in queries
+        ]
+        
+        # Embed only the queries that aren't memoized, in one batch
+        keys = [fingerprint(query) for query in processed]
+        embeddings = [self._query_cache.get(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            vectors = await self.embedder.embed_batch([processed[i] for i in missing])
+            for i, vector in zip(missing, vectors):
+                embeddings[i] = vector
+                self._query_cache.put(keys[i], vector)
+        
+        results = await self.vector_store.search_batch(
+            query_embeddings=embeddings,
+            top_k=top_k,
+            filter_metadata=self._build_filter(context, filter_metadata)
+        )
+        
+        logger.info(f"Batch retrieved documents for {len(queries)} queries")
+        return [self._post_process(query_results) for query_results in results]
+    
+    async def _embed_and_search(
+        self,
+        query: str,
+        top_k: int,
+        context: Optional[Dict[str, Any]] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchResult]:
+        """
+        Preprocess and embed the query, then search the vector store (no post-processing).
+        """
         # Step 1: Preprocess query
         processed_query = self._preprocess_query(query) if self.enable_preprocessing else query
         logger.debug(f"Processed query: '{processed_query}'")
         
         # Step 2: Embed the query
-        query_embedding = await self.embedder.embed_text(processed_query)
+        query_embedding = await self._embed_query(processed_query)
         logger.debug(f"Query embedded: {len(query_embedding)} dimensions")
         
         # Step 3: Build metadata filter
         combined_filter = self._build_filter(context, filter_metadata)
         
         # Step 4: Search vector store
-        results = await self.vector_store.search(
-            query_embedding=query_embedding,
-            top_k=top_k,
-            filter_metadata=combined_filter
-        )
+        if self.batch_window_ms > 0:
+            results = await self._search_coalesced(query_embedding, top_k, combined_filter)
+        else:
+            results = await self.vector_store.search(
+                query_embedding=query_embedding,
+                top_k=top_k,
+                filter_metadata=combined_filter
+            )
         
         logger.info(f"Retrieved {len(results)} documents before filtering")
+        return results
+    
+    async def _search_coalesced(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]],
+    ) -> List[SearchResult]:
+        """
+        Queue a search and wait for its slice of a batched search.
         
-        # Step 5: Post-process (filter by score, deduplicate)
-        filtered_results = self._post_process(results)
+        The first query for a (top_k, filter) group opens a batch_window_ms
+        window; everything arriving in that window (up to max_batch) goes
+        to the vector store as one search_batch() request.
+        """
+        key = (top_k, repr(sorted(filter_metadata.items())) if filter_metadata else "")
+        future = asyncio.get_running_loop().create_future()
+        
+        batch = self._pending.setdefault(key, [])
+        batch.append((query_embedding, future))
+        if len(batch) >= self.max_batch:
+            del self._pending[key]
+            # Sent early: the window timer has nothing left to flush
+            timer = self._flush_timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            self._spawn(self._send_batch(batch, top_k, filter_metadata))
+        elif len(batch) == 1:
+            self._flush_timers[key] = self._spawn(
+                self._flush_after_window(key, batch, top_k, filter_metadata)
+            )
         
-        logger.info(f"Returning {len(filtered_results)} documents after filtering")
-        return filtered_results
+        return await future
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+        return task
+    
+    async def _flush_after_window(
+        self,
+        key: Tuple[int, str],
+        batch: List[Tuple[List[float], asyncio.Future]],
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Send batch once the window closes, unless it already filled up.
+        """
+        await asyncio.sleep(self.batch_window_ms / 1000)
+        if self._flush_timers.get(key) is asyncio.current_task():
+            del self._flush_timers[key]
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+            await self._send_batch(batch, top_k, filter_metadata)
+    
+    async def _send_batch(
+        self,
+        batch: List[Tuple[List[float], asyncio.Future]],
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Run one search_batch() for the queued queries and resolve their futures.
+        """
+        try:
+            results = await self.vector_store.search_batch(
+                query_embeddings=[embedding for embedding, _ in batch],
+                top_k=top_k,
+                filter_metadata=filter_metadata
+            )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        logger.debug(f"Coalesced {len(batch)} searches into one batch request")
+        for (_, future), query_results in zip(batch, results):
+            if not future.done():
+                future.set_result(query_results)
+    
+    async def close(self) -> None:
+        """
+        Cancel pending and in-flight coalesced searches.
+        
+        Callers still waiting on a cancelled search get CancelledError.
+        Call this during application shutdown.
+        """
+        for batch in self._pending.values():
+            for _, future in batch:
+                future.cancel()
+        self._pending.clear()
+        self._flush_timers.clear()
+        
+        tasks = list(self._batch_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _embed_query(self, processed_query: str) -> List[float]:
+        """
+        Embed a preprocessed query, reusing the memoized vector when available.
+        """
+        key = fingerprint(processed_query)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        query_embedding = await self.embedder.embed_text(processed_query)
+        self._query_cache.put(key, query_embedding)
+        return query_embedding
+    
+    async def warmup(self, queries: Optional[List[str]] = None) -> None:
+        """
+        Run one throwaway embedding and search so the first real query
+        doesn't pay for model kernel warm-up and cold Qdrant pages.
+        
+        Call once at startup, after the vector store is initialized.
+        
+        Args:
+            queries: Common queries to prefetch instead (e.g. WARMUP_QUERIES).
+                     They are embedded in one batch and memoized, so users
+                     asking them skip the embedding step entirely.
+        """
+        if queries:
+            await self.retrieve_batch(queries, top_k=1)
+            logger.info(f"Retriever warmed up with {len(queries)} queries")
+            return
+        
+        query_embedding = await self.embedder.embed_text("How can I stay focused?")
+        await self.vector_store.search(query_embedding=query_embedding, top_k=1)
+        logger.info("Retriever warmed up")
+    
+    def clear_cache(self) -> None:
+        """
+        Drop memoized query embeddings (call after swapping the embedding model).
+        """
+        self._query_cache.clear()
     
     def _preprocess_query(self, query: str) -> str:
         """
@@ -146,10 +389,10 @@ class Retriever:
         """
         # Strip and normalize whitespace
         cleaned = query.strip()
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned)
         
         # Remove control characters but keep punctuation
-        cleaned = re.sub(r'[\x00-\x1F\x7F]', '', cleaned)
+        cleaned = _CONTROL_CHARS_RE.sub('', cleaned)
         
         return cleaned
     
@@ -217,14 +460,12 @@ class Retriever:
                 f"below threshold {self.min_score_threshold}"
             )
         
-        # Remove exact duplicates (same document ID)
-        seen_ids = set()
-        deduplicated = []
+        # Remove exact duplicates (same document ID), keeping the first
+        # (highest-scoring) hit; dicts preserve insertion order
+        unique: Dict[str, SearchResult] = {}
         for result in filtered:
-            doc_id = result.document.id
-            if doc_id not in seen_ids:
-                seen_ids.add(doc_id)
-                deduplicated.append(result)
+            unique.setdefault(result.document.id, result)
+        deduplicated = list(unique.values())
         
         if len(deduplicated) < len(filtered):
             logger.debug(f"Removed {len(filtered) - len(deduplicated)} duplicate documents")
@@ -255,13 +496,11 @@ class Retriever:
         Note: Currently just retrieves top-k from rerank_top_k.
               Future: Add cross-encoder reranking model.
         """
-        # Fetch more documents than needed
-        results = await self.retrieve(
-            query=query,
-            top_k=rerank_top_k,
-            context=context
-        )
+        # Fetch more candidates than needed
+        candidates = await self._embed_and_search(query, rerank_top_k, context)
+        
+        # TODO: Implement actual reranking with cross-encoder (reorder
+        # candidates here, before the single post-processing pass)
         
-        # TODO: Implement actual reranking with cross-encoder
-        # For now, just return top-k from the initial results
-        return results[:top_k]
+        # Filter/dedupe once, then keep the best top_k
+        return self._post_process(candidates)[:top_k]
@@ -2,12 +2,13 @@
 Base class for vector storage systems.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """
     Represents a document in the knowledge base.
@@ -24,7 +25,7 @@ class Document:
     metadata: Dict[str, Any] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """
     Result from vector similarity search.
@@ -79,6 +80,46 @@ class BaseVectorStore(ABC):
         """
         pass
     
+    async def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Run several searches that share top_k and filters.
+        
+        Default implementation issues the searches concurrently; stores
+        with a native batch API should override it.
+        
+        Args:
+            query_embeddings: One vector per query
+            top_k: Number of results per query
+            filter_metadata: Optional filters shared by all queries
+            
+        Returns:
+            One list of SearchResult objects per query, in input order
+        """
+        return list(await asyncio.gather(*[
+            self.search(embedding, top_k=top_k, filter_metadata=filter_metadata)
+            for embedding in query_embeddings
+        ]))
+    
+    async def search_stream(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[SearchResult]:
+        """
+        Yield search results best-first.
+        
+        Default implementation wraps search(); stores that can convert or
+        receive results incrementally should override it.
+        """
+        for result in await self.search(query_embedding, top_k=top_k, filter_metadata=filter_metadata):
+            yield result
+    
     @abstractmethod
     async def delete_by_id(self, document_id: str) -> bool:
         """
@@ -92,6 +133,24 @@ class BaseVectorStore(ABC):
         """
         pass
     
+    async def delete_by_ids(self, document_ids: List[str]) -> bool:
+        """
+        Remove several documents from the store.
+        
+        Default implementation issues the deletes concurrently; stores
+        with a native bulk delete should override it.
+        
+        Args:
+            document_ids: Unique identifiers of documents to delete
+            
+        Returns:
+            True if every delete succeeded
+        """
+        results = await asyncio.gather(*[
+            self.delete_by_id(document_id) for document_id in document_ids
+        ])
+        return all(results)
+    
     @abstractmethod
     async def clear(self) -> None:
         """
@@ -44,6 +44,15 @@ def get_vector_store() -> QdrantVectorStore:
             api_key=settings.qdrant_api_key if settings.qdrant_api_key else None,
             collection_name=settings.qdrant_collection_name,
             vector_size=settings.qdrant_vector_size,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port,
+            pool_size=settings.qdrant_pool_size,
+            scalar_quantization=settings.qdrant_scalar_quantization,
+            quantization_oversampling=settings.qdrant_quantization_oversampling,
+            hnsw_ef=settings.qdrant_hnsw_ef,
+            on_disk_vectors=settings.qdrant_on_disk_vectors,
+            on_disk_payload=settings.qdrant_on_disk_payload,
+            float16_vectors=settings.qdrant_float16_vectors,
         )
         logger.info(
             f"Created vector store: {settings.qdrant_url}/"
@@ -12,6 +12,8 @@ import logging
 from typing import List
 from datetime import datetime
 
+import numpy as np
+
 from .qdrant_store import QdrantVectorStore
 from .base_store import Document
 
@@ -69,19 +71,22 @@ async def example_basic_usage():
     ]
     
     # Create dummy embeddings (in real use, generate with OpenAI)
-    # Each vector is 384 dimensions (matching vector_size)
-    embeddings = [
-        [0.1] * 384,  # doc-1 embedding
-        [0.2] * 384,  # doc-2 embedding
-        [0.3] * 384,  # doc-3 embedding
-    ]
-    
-    # Add documents
-    await store.add_documents(documents, embeddings)
+    # One float32 row of 384 dimensions per document (matching vector_size);
+    # embedders return this shape with return_numpy=True
+    embeddings = np.array([
+        np.full(384, 0.1, dtype=np.float32),  # doc-1 embedding
+        np.full(384, 0.2, dtype=np.float32),  # doc-2 embedding
+        np.full(384, 0.3, dtype=np.float32),  # doc-3 embedding
+    ])
+    
+    # Add documents. For large loads, bulk_load() pauses HNSW indexing so
+    # the graph is built once at the end instead of on every upsert
+    async with store.bulk_load():
+        await store.add_documents(documents, embeddings)
     print(f"✓ Added {len(documents)} documents")
     
     # Search without filters
-    query_embedding = [0.15] * 384  # Similar to doc-1
+    query_embedding = np.full(384, 0.15, dtype=np.float32)  # Similar to doc-1
     results = await store.search(query_embedding, top_k=2)
     
     print(f"\n✓ Search results (top 2):")
@@ -143,32 +148,28 @@ async def example_metadata_filtering():
         ),
     ]
     
-    embeddings = [[0.1] * 384, [0.2] * 384, [0.3] * 384]
+    embeddings = np.array([np.full(384, v, dtype=np.float32) for v in (0.1, 0.2, 0.3)])
     
     await store.add_documents(documents, embeddings)
     print("✓ Added documents with metadata")
     
-    # Search with user filter
-    query_embedding = [0.15] * 384
+    # Search with a user filter and a category filter; both searches go
+    # to Qdrant in a single request
+    query_embedding = np.full(384, 0.15, dtype=np.float32)
+    
+    user_results, tip_results = await store.search_many([
+        (query_embedding, 5, {"user_id": "user-123"}),
+        (query_embedding, 5, {"category": "focus_tips"}),
+    ])
     
     print("\n1. Search for user-123 only:")
-    results = await store.search(
-        query_embedding,
-        top_k=5,
-        filter_metadata={"user_id": "user-123"}
-    )
-    print(f"   Found {len(results)} results")
-    for r in results:
+    print(f"   Found {len(user_results)} results")
+    for r in user_results:
         print(f"   - {r.document.content}")
     
     print("\n2. Search for focus_tips category:")
-    results = await store.search(
-        query_embedding,
-        top_k=5,
-        filter_metadata={"category": "focus_tips"}
-    )
-    print(f"   Found {len(results)} results")
-    for r in results:
+    print(f"   Found {len(tip_results)} results")
+    for r in tip_results:
         print(f"   - {r.document.content}")
     
     # Cleanup
@@ -225,13 +226,13 @@ async def example_user_personalization():
         ),
     ]
     
-    embeddings = [[0.1] * 384, [0.2] * 384, [0.3] * 384]
+    embeddings = np.array([np.full(384, v, dtype=np.float32) for v in (0.1, 0.2, 0.3)])
     
     await store.add_documents(documents, embeddings)
     print(f"✓ Stored {len(documents)} personalized insights for {user_id}")
     
     # Query: "What time should I schedule my focus session?"
-    query_embedding = [0.12] * 384
+    query_embedding = np.full(384, 0.12, dtype=np.float32)
     
     results = await store.search(
         query_embedding,
@@ -270,11 +271,11 @@ async def example_crud_operations():
         content="This is a test document",
         metadata={"category": "test"}
     )
-    await store.add_documents([doc], [[0.5] * 384])
+    await store.add_documents([doc], np.full((1, 384), 0.5, dtype=np.float32))
     print("✓ Created document")
     
     # Read
-    results = await store.search([0.5] * 384, top_k=1)
+    results = await store.search(np.full(384, 0.5, dtype=np.float32), top_k=1)
     print(f"✓ Read document: {results[0].document.content}")
     
     # Update (overwrite by adding same ID)
@@ -283,17 +284,17 @@ async def example_crud_operations():
         content="This is an UPDATED test document",
         metadata={"category": "test", "version": "2"}
     )
-    await store.add_documents([updated_doc], [[0.5] * 384])
+    await store.add_documents([updated_doc], np.full((1, 384), 0.5, dtype=np.float32))
     print("✓ Updated document")
     
-    results = await store.search([0.5] * 384, top_k=1)
+    results = await store.search(np.full(384, 0.5, dtype=np.float32), top_k=1)
     print(f"✓ Verified update: {results[0].document.content}")
     
     # Delete
     deleted = await store.delete_by_id("test-doc")
     print(f"✓ Deleted document: {deleted}")
     
-    results = await store.search([0.5] * 384, top_k=1)
+    results = await store.search(np.full(384, 0.5, dtype=np.float32), top_k=1)
     print(f"✓ Search after delete: {len(results)} results")
     
     # Cleanup
@@ -302,7 +303,7 @@ async def example_crud_operations():
 
 
 async def run_all_examples():
-    """Run all examples sequentially."""
+    """Run all examples concurrently (each uses its own collection)."""
     print("\n" + "="*60)
     print("QDRANT VECTOR STORE EXAMPLES")
     print("="*60)
@@ -310,10 +311,14 @@ async def run_all_examples():
     print("Run: docker-compose up -d qdrant")
     print("="*60)
     
-    await example_basic_usage()
-    await example_metadata_filtering()
-    await example_user_personalization()
-    await example_crud_operations()
+    # Collections are disjoint, so the examples can't interfere; output
+    # from different examples may interleave
+    await asyncio.gather(
+        example_basic_usage(),
+        example_metadata_filtering(),
+        example_user_personalization(),
+        example_crud_operations(),
+    )
     
     print("\n" + "="*60)
     print("All examples completed successfully! ✓")
@@ -321,4 +326,11 @@ async def run_all_examples():
 
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to the stock loop (e.g. Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(run_all_examples())
@@ -5,20 +5,42 @@ Production-ready vector storage using Qdrant for FocusGuard RAG pipeline.
 Supports both local Docker and Qdrant Cloud deployments.
 """
 
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, ClassVar, Optional, Sequence, Set, Tuple, Union
 from datetime import datetime
+import asyncio
 import logging
 import uuid
 
+import grpc
+import httpx
+import numpy as np
+
 from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.models import (
+    Datatype,
     Distance,
     VectorParams,
-    PointStruct,
+    Batch,
     Filter,
     FieldCondition,
+    FilterSelector,
+    HasIdCondition,
+    HnswConfigDiff,
+    MatchAny,
     MatchValue,
-    SearchRequest,
+    OptimizersConfigDiff,
+    PayloadSchemaType,
+    PayloadSelectorInclude,
+    PointIdsList,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    UpdateStatus,
 )
 from qdrant_client.http.exceptions import UnexpectedResponse
 
@@ -28,6 +50,10 @@ from .base_store import BaseVectorStore, Document, SearchResult
 logger = logging.getLogger(__name__)
 
 
+# Qdrant's default: segments larger than this (in KB) get an HNSW index
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+
 def _ensure_uuid(doc_id: str) -> str:
     """
     Convert document ID to valid UUID format.
@@ -57,6 +83,117 @@ def _ensure_uuid(doc_id: str) -> str:
         return str(uuid.uuid5(uuid.NAMESPACE_DNS, doc_id))
 
 
+# Shared clients keyed by connection settings, so stores for different
+# collections on the same server reuse one connection pool (and its
+# keep-alive/TLS connections). Reference-counted: the last close() closes it.
+_ClientKey = Tuple[str, Optional[str], bool, int, int]
+_clients: Dict[_ClientKey, AsyncQdrantClient] = {}
+_client_refs: Dict[_ClientKey, int] = {}
+
+# Collection configs initialize() has already set up through each shared
+# client, so repeated initialize() calls (tests, per-request services) skip
+# the RPCs. Dropped together with the client.
+_CollectionConfig = Tuple[str, int, str, bool, bool, bool, bool]
+_initialized_collections: Dict[_ClientKey, Set[_CollectionConfig]] = {}
+
+
+def _acquire_client(key: _ClientKey) -> AsyncQdrantClient:
+    """
+    Get the shared client for connection settings, creating it lazily.
+    """
+    client = _clients.get(key)
+    if client is None:
+        url, api_key, prefer_grpc, grpc_port, pool_size = key
+        client = AsyncQdrantClient(
+            url=url,
+            api_key=api_key,
+            timeout=30.0,
+            prefer_grpc=prefer_grpc,
+            grpc_port=grpc_port,
+            # The client's localhost default disables keep-alive entirely
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+        )
+        _clients[key] = client
+        _initialized_collections[key] = set()
+    _client_refs[key] = _client_refs.get(key, 0) + 1
+    return client
+
+
+def _release_client(key: _ClientKey) -> Optional[AsyncQdrantClient]:
+    """
+    Drop one reference to a shared client.
+    
+    Returns:
+        The client if this was the last reference (caller closes it), else None
+    """
+    _client_refs[key] -= 1
+    if _client_refs[key] > 0:
+        return None
+    del _client_refs[key]
+    del _initialized_collections[key]
+    return _clients.pop(key)
+
+
+def _is_already_exists(error: Exception) -> bool:
+    """
+    Whether a create_collection error means the collection already exists.
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 409
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.ALREADY_EXISTS
+    return False
+
+
+# Filter values Qdrant can match, and that can be frozen into a cache key
+_SCALAR_TYPES = (str, int, bool)
+
+
+def _field_match(value: Any) -> Union[MatchAny, MatchValue]:
+    """
+    Sequences match any element; scalars match exactly.
+    """
+    if isinstance(value, (list, tuple, set)):
+        return MatchAny(any=list(value))
+    return MatchValue(value=value)
+
+
+def _freeze_value(value: Any) -> Optional[Tuple[type, Any]]:
+    """
+    Hashable, type-tagged form of a filter value, or None if not cacheable.
+    
+    The type is part of the key because True == 1 hash equal, and a filter
+    for 1 must not come back as a cached MatchValue(value=True).
+    """
+    if isinstance(value, (list, tuple, set)):
+        if not all(isinstance(item, _SCALAR_TYPES) for item in value):
+            return None
+        return (tuple, tuple((type(item), item) for item in value))
+    if isinstance(value, _SCALAR_TYPES):
+        return (type(value), value)
+    return None
+
+
+@lru_cache(maxsize=256)
+def _cached_filter(items: Tuple[Tuple[str, Tuple[type, Any]], ...]) -> Filter:
+    """
+    Build (once per distinct filter) a Filter from _freeze_value() items.
+    """
+    return Filter(must=[
+        FieldCondition(
+            key=key,
+            match=(
+                MatchAny(any=[item for _, item in value]) if kind is tuple
+                else MatchValue(value=value)
+            ),
+        )
+        for key, (kind, value) in items
+    ])
+
+
 class QdrantVectorStore(BaseVectorStore):
     """
     Qdrant-based vector storage implementation.
@@ -81,6 +218,19 @@ class QdrantVectorStore(BaseVectorStore):
         ```
     """
     
+    # Every payload field the app filters on; unindexed filters fall back
+    # to scanning payloads. List fields (tags) are indexed per element.
+    PAYLOAD_INDEXES: ClassVar[Dict[str, PayloadSchemaType]] = {
+        "category": PayloadSchemaType.KEYWORD,
+        "user_id": PayloadSchemaType.KEYWORD,
+        "session_id": PayloadSchemaType.KEYWORD,
+        "pattern_type": PayloadSchemaType.KEYWORD,
+        "distraction_type": PayloadSchemaType.KEYWORD,
+        "source": PayloadSchemaType.KEYWORD,
+        "tags": PayloadSchemaType.KEYWORD,
+        "created_at": PayloadSchemaType.DATETIME,
+    }
+    
     def __init__(
         self,
         url: str = "http://localhost:6333",
@@ -88,6 +238,15 @@ class QdrantVectorStore(BaseVectorStore):
         collection_name: str = "focusguard_knowledge",
         vector_size: int = 1536,
         distance: Distance = Distance.COSINE,
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        scalar_quantization: bool = False,
+        float16_vectors: bool = False,
+        quantization_oversampling: float = 2.0,
+        pool_size: int = 64,
+        hnsw_ef: Optional[int] = 64,
+        on_disk_vectors: bool = False,
+        on_disk_payload: bool = False,
     ):
         """
         Initialize Qdrant vector store.
@@ -98,21 +257,61 @@ class QdrantVectorStore(BaseVectorStore):
             collection_name: Name of the collection to store vectors
             vector_size: Dimension of embedding vectors (1536 for text-embedding-3-small)
             distance: Distance metric (COSINE recommended for text embeddings)
+            prefer_grpc: Use the gRPC transport (protobuf instead of JSON +
+                         pydantic parsing; faster for bulk upserts and search)
+            grpc_port: Qdrant gRPC port (used when prefer_grpc=True)
+            scalar_quantization: Create the collection with INT8 scalar
+                                 quantization (4x smaller vectors kept in RAM,
+                                 full-precision originals moved to disk).
+                                 Searches walk the INT8 copies, then rescore
+                                 the best candidates with the originals.
+            float16_vectors: Store vectors as float16 on the server (half the
+                             memory/disk of float32). Only applies when the
+                             collection is created.
+            quantization_oversampling: With scalar_quantization, fetch
+                                       top_k * oversampling INT8 candidates
+                                       for full-precision rescoring
+            pool_size: Max (and kept-alive) REST connections, so concurrent
+                       upserts/searches reuse connections instead of
+                       reconnecting. gRPC multiplexes over one channel.
+                       Stores with the same url, api_key and transport
+                       settings share one client.
+            hnsw_ef: Minimum HNSW search beam width; each search uses
+                     max(hnsw_ef, 4 * top_k). Lower = fewer graph hops per
+                     query. None uses the server default (ef_construct).
+            on_disk_vectors: Store vectors in memory-mapped files so the OS
+                             page cache keeps only the hot ones in RAM; the
+                             HNSW graph stays in RAM. Only applies when the
+                             collection is created.
+            on_disk_payload: Keep payloads (document text) on disk; indexed
+                             payload fields stay in RAM. Only applies when
+                             the collection is created.
         """
         self.url = url
         self.api_key = api_key
         self.collection_name = collection_name
         self.vector_size = vector_size
         self.distance = distance
+        self.scalar_quantization = scalar_quantization
+        self.float16_vectors = float16_vectors
+        self.hnsw_ef = hnsw_ef
+        self.on_disk_vectors = on_disk_vectors
+        self.on_disk_payload = on_disk_payload
         
-        # Initialize async client
-        self.client = AsyncQdrantClient(
-            url=url,
-            api_key=api_key,
-            timeout=30.0,
-        )
+        # Rescoring keeps quantized search accuracy close to full precision
+        self._quantization_params = None
+        if scalar_quantization:
+            self._quantization_params = QuantizationSearchParams(
+                rescore=True,
+                oversampling=quantization_oversampling,
+            )
+        
+        # Async client, shared with other stores on the same server
+        self._client_key: Optional[_ClientKey] = (url, api_key, prefer_grpc, grpc_port, pool_size)
+        self.client = _acquire_client(self._client_key)
         
-        logger.info(f"Initialized QdrantVectorStore: {url}/{collection_name}")
+        transport = f"gRPC :{grpc_port}" if prefer_grpc else "REST"
+        logger.info(f"Initialized QdrantVectorStore: {url}/{collection_name} ({transport})")
     
     async def initialize(self) -> None:
         """
@@ -120,68 +319,210 @@ class QdrantVectorStore(BaseVectorStore):
         
         Sets up:
         - Vector configuration (size, distance metric)
-        - Payload indexing for metadata filtering
+        - Payload indexing for metadata filtering (missing indexes are
+          also back-filled on an existing collection)
         
-        Call this once during application startup.
+        Call this once during application startup; later calls through
+        the same shared client for the same collection and vector config
+        return without contacting Qdrant. A collection deleted by another
+        process is not noticed until the client is closed.
         """
-        try:
-            # Check if collection exists
-            collections = await self.client.get_collections()
-            collection_exists = any(
-                col.name == self.collection_name 
-                for col in collections.collections
+        initialized = _initialized_collections[self._client_key]
+        config = self._collection_config()
+        if config in initialized:
+            return
+        
+        if await self.client.collection_exists(collection_name=self.collection_name):
+            logger.info(f"Collection '{self.collection_name}' already exists")
+            await self._create_missing_payload_indexes()
+        else:
+            try:
+                await self._create_collection()
+            except (UnexpectedResponse, grpc.RpcError) as e:
+                # Another process created it between the check and create
+                if not _is_already_exists(e):
+                    logger.error(f"Failed to initialize collection: {e}")
+                    raise
+                logger.info(f"Collection '{self.collection_name}' was created concurrently")
+                await self._create_missing_payload_indexes()
+        
+        initialized.add(config)
+    
+    def _collection_config(self) -> _CollectionConfig:
+        """
+        Everything initialize() applies when it creates the collection.
+        """
+        return (
+            self.collection_name,
+            self.vector_size,
+            self.distance.name,
+            self.scalar_quantization,
+            self.float16_vectors,
+            self.on_disk_vectors,
+            self.on_disk_payload,
+        )
+    
+    def _forget_collection(self) -> None:
+        """
+        Drop every remembered config for this collection (it was deleted).
+        """
+        initialized = _initialized_collections.get(self._client_key)
+        if initialized:
+            initialized.difference_update(
+                [config for config in initialized if config[0] == self.collection_name]
             )
-            
-            if collection_exists:
-                logger.info(f"Collection '{self.collection_name}' already exists")
-                return
-            
-            # Create collection with vector configuration
-            await self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=self.vector_size,
-                    distance=self.distance,
-                ),
+    
+    async def _create_collection(self) -> None:
+        """
+        Create the collection and its payload indexes (no existence check).
+        """
+        # Create collection with vector configuration
+        quantization_config = None
+        if self.scalar_quantization:
+            quantization_config = ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,  # Clip outliers for a tighter INT8 range
+                    always_ram=True,
+                )
             )
-            
-            # Create payload indexes for efficient filtering
-            # Index commonly filtered fields
-            await self.client.create_payload_index(
+        
+        await self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(
+                size=self.vector_size,
+                distance=self.distance,
+                # INT8 copies serve search from RAM; originals only for rescoring
+                on_disk=self.on_disk_vectors or self.scalar_quantization,
+                datatype=Datatype.FLOAT16 if self.float16_vectors else None,
+            ),
+            # Graph traversal is random access - keep it in RAM even when
+            # vectors are memory-mapped
+            hnsw_config=HnswConfigDiff(on_disk=False),
+            on_disk_payload=self.on_disk_payload,
+            quantization_config=quantization_config,
+        )
+        
+        await self._create_payload_indexes()
+        
+        logger.info(f"Created collection '{self.collection_name}' with indexes")
+    
+    async def _create_payload_indexes(self) -> None:
+        """
+        Create the PAYLOAD_INDEXES on a newly created collection.
+        """
+        # Independent requests, sent together
+        await asyncio.gather(*[
+            self.client.create_payload_index(
                 collection_name=self.collection_name,
-                field_name="category",
-                field_schema="keyword",
+                field_name=field_name,
+                field_schema=field_schema,
             )
-            
-            await self.client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name="user_id",
-                field_schema="keyword",
+            for field_name, field_schema in self.PAYLOAD_INDEXES.items()
+        ])
+    
+    async def _create_missing_payload_indexes(self) -> None:
+        """
+        Back-fill PAYLOAD_INDEXES fields an existing collection doesn't index yet.
+        """
+        info = await self.client.get_collection(collection_name=self.collection_name)
+        vectors = info.config.params.vectors
+        if isinstance(vectors, VectorParams) and vectors.size != self.vector_size:
+            logger.warning(
+                f"Collection '{self.collection_name}' stores {vectors.size}-d vectors, "
+                f"but this store expects {self.vector_size}-d; recreate it with clear(recreate=True)"
             )
-            
-            await self.client.create_payload_index(
+        indexed = info.payload_schema or {}
+        missing = [
+            self.client.create_payload_index(
                 collection_name=self.collection_name,
-                field_name="session_id",
-                field_schema="keyword",
+                field_name=field_name,
+                field_schema=field_schema,
             )
+            for field_name, field_schema in self.PAYLOAD_INDEXES.items()
+            if field_name not in indexed
+        ]
+        if missing:
+            await asyncio.gather(*missing)
+            logger.info(f"Created {len(missing)} missing payload index(es) on '{self.collection_name}'")
+    
+    async def pause_indexing(self) -> None:
+        """
+        Stop HNSW index building, e.g. before a bulk upload.
+        
+        Points stay searchable (brute force) while indexing is paused.
+        Call resume_indexing() when the bulk load is done so the graph is
+        built once instead of being mutated on every batch.
+        """
+        await self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
+        )
+        logger.info(f"Paused HNSW indexing on '{self.collection_name}'")
+    
+    async def resume_indexing(self, indexing_threshold: int = DEFAULT_INDEXING_THRESHOLD) -> None:
+        """
+        Re-enable HNSW index building after pause_indexing().
+        
+        Args:
+            indexing_threshold: Segment size (KB) above which Qdrant builds the index
+        """
+        await self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=indexing_threshold),
+        )
+        logger.info(f"Resumed HNSW indexing on '{self.collection_name}'")
+    
+    @asynccontextmanager
+    async def bulk_load(
+        self,
+        indexing_threshold: int = DEFAULT_INDEXING_THRESHOLD
+    ) -> AsyncIterator["QdrantVectorStore"]:
+        """
+        Pause HNSW indexing for the duration of a bulk load.
+        
+        Indexing is resumed on exit even if the load fails, so the graph
+        is built once in a single pass after all points are in.
+        
+        Args:
+            indexing_threshold: Threshold restored on exit (see resume_indexing())
             
-            logger.info(f"Created collection '{self.collection_name}' with indexes")
-            
-        except UnexpectedResponse as e:
-            logger.error(f"Failed to initialize collection: {e}")
-            raise
+        Example:
+            ```python
+            async with store.bulk_load():
+                await store.add_documents(documents, embeddings)
+            ```
+        """
+        await self.pause_indexing()
+        try:
+            yield self
+        finally:
+            await self.resume_indexing(indexing_threshold)
     
     async def add_documents(
         self,
         documents: List[Document],
-        embeddings: List[List[float]]
+        embeddings: Union[np.ndarray, List[List[float]]],
+        batch_size: int = 256,
+        max_concurrency: int = 4,
+        wait: bool = True
     ) -> None:
         """
         Store documents with their embeddings in Qdrant.
         
+        Points are sent as batch_size upserts, with up to max_concurrency
+        requests in flight at once, so large document sets aren't bound
+        by a single round trip.
+        
         Args:
             documents: List of Document objects with content and metadata
             embeddings: Corresponding vector embeddings for each document
+                        ((N, D) NumPy matrix or list of vectors)
+            batch_size: Points per upsert request
+            max_concurrency: Maximum upsert requests in flight
+            wait: Block until Qdrant has applied each batch. wait=False
+                  returns once batches are accepted (WAL-acknowledged),
+                  so points may not be searchable immediately
             
         Raises:
             ValueError: If documents and embeddings length mismatch
@@ -197,59 +538,201 @@ class QdrantVectorStore(BaseVectorStore):
             logger.warning("No documents to add")
             return
         
-        # Convert documents to Qdrant points
-        points = []
-        for doc, embedding in zip(documents, embeddings):
-            # Prepare payload (metadata + content)
-            payload = {
-                "document_id": doc.id,  # Store original ID in payload
-                "content": doc.content,
-                "created_at": datetime.utcnow().isoformat(),
-            }
-            
-            # Add metadata if present
-            if doc.metadata:
-                # Ensure metadata fields are properly typed
-                metadata = doc.metadata.copy()
-                
-                # Handle tags as list of strings
-                if "tags" in metadata and isinstance(metadata["tags"], list):
-                    metadata["tags"] = [str(tag) for tag in metadata["tags"]]
-                
-                payload.update(metadata)
+        # Column-oriented batch: no per-point PointStruct objects, and a
+        # NumPy matrix is converted to lists in a single C-level call
+        if isinstance(embeddings, np.ndarray):
+            vectors = np.asarray(embeddings, dtype=np.float32).tolist()
+        else:
+            vectors = list(embeddings)
+        
+        created_at = datetime.utcnow().isoformat()
+        ids = [_ensure_uuid(doc.id) for doc in documents]  # Qdrant needs UUID/int IDs
+        payloads = [
+            self._build_payload(doc.id, doc.content, doc.metadata, created_at)
+            for doc in documents
+        ]
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def upsert_batch(start: int) -> None:
+            end = start + batch_size
+            async with semaphore:
+                await self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=Batch(ids=ids[start:end], vectors=vectors[start:end], payloads=payloads[start:end]),
+                    wait=wait,
+                )
+        
+        await asyncio.gather(*[
+            upsert_batch(start) for start in range(0, len(ids), batch_size)
+        ])
+        
+        logger.info(f"Added {len(documents)} documents to '{self.collection_name}'")
+    
+    async def upload_documents(
+        self,
+        documents: List[Document],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        batch_size: int = 256,
+        parallel: int = 1,
+        wait: bool = True
+    ) -> None:
+        """
+        Bulk-upload documents with the client's batched uploader.
+        
+        Convenience wrapper around upload_columns() for callers that
+        already hold Document objects.
+        
+        Args:
+            documents: List of Document objects with content and metadata
+            embeddings: (N, D) embedding matrix aligned with documents
+            batch_size: Points per upload request
+            parallel: Worker processes used by the uploader (1 = in-thread)
+            wait: Block until Qdrant has applied each batch
             
-            # Convert ID to valid UUID format for Qdrant
-            point_id = _ensure_uuid(doc.id)
+        Raises:
+            ValueError: If documents and embeddings length mismatch
+        """
+        await self.upload_columns(
+            ids=[doc.id for doc in documents],
+            contents=[doc.content for doc in documents],
+            metadatas=[doc.metadata for doc in documents],
+            embeddings=embeddings,
+            batch_size=batch_size,
+            parallel=parallel,
+            wait=wait,
+        )
+    
+    async def upload_columns(
+        self,
+        ids: Sequence[str],
+        contents: Sequence[str],
+        metadatas: Sequence[Optional[Dict[str, Any]]],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        batch_size: int = 256,
+        parallel: int = 1,
+        wait: bool = True
+    ) -> None:
+        """
+        Bulk-upload parallel id/content/metadata columns with their embeddings.
+        
+        Unlike add_documents(), nothing is sent as one request and no
+        Document objects are needed: the embedding matrix (NumPy arrays
+        are passed through as-is), IDs and payloads are streamed to Qdrant
+        in batch_size requests with automatic retries. Use for ingestion; add_documents()
+        remains the simple path for a few documents.
+        
+        Args:
+            ids: Document IDs
+            contents: Document texts, aligned with ids
+            metadatas: Metadata dicts (or None), aligned with ids
+            embeddings: (N, D) embedding matrix aligned with ids
+            batch_size: Points per upload request
+            parallel: Worker processes used by the uploader (1 = in-thread)
+            wait: Block until Qdrant has applied each batch. wait=False
+                  returns once batches are accepted (WAL-acknowledged),
+                  so points may not be searchable immediately
             
-            points.append(
-                PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload=payload,
-                )
+        Raises:
+            ValueError: If column lengths don't match
+        """
+        if not (len(ids) == len(contents) == len(metadatas) == len(embeddings)):
+            raise ValueError(
+                f"Documents count ({len(ids)}) must match "
+                f"embeddings count ({len(embeddings)})"
             )
         
-        # Batch upsert to Qdrant
-        await self.client.upsert(
+        if not ids:
+            logger.warning("No documents to upload")
+            return
+        
+        created_at = datetime.utcnow().isoformat()
+        
+        # Hand the client one contiguous float32 matrix (no per-float
+        # Python objects); a float16 collection converts on the server
+        if isinstance(embeddings, np.ndarray):
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        
+        # upload_collection is a blocking call - keep it off the event loop
+        await asyncio.to_thread(
+            self.client.upload_collection,
             collection_name=self.collection_name,
-            points=points,
+            vectors=embeddings,
+            payload=[
+                self._build_payload(doc_id, content, metadata, created_at)
+                for doc_id, content, metadata in zip(ids, contents, metadatas)
+            ],
+            ids=[_ensure_uuid(doc_id) for doc_id in ids],
+            batch_size=batch_size,
+            parallel=parallel,
+            wait=wait,
         )
         
-        logger.info(f"Added {len(points)} documents to '{self.collection_name}'")
+        logger.info(f"Uploaded {len(ids)} documents to '{self.collection_name}'")
+    
+    @staticmethod
+    def _build_payload(
+        doc_id: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]],
+        created_at: str
+    ) -> Dict[str, Any]:
+        """
+        Build the Qdrant payload (content + metadata) for a document.
+        """
+        # One dict build per document; metadata keys override the base fields
+        payload = {
+            "document_id": doc_id,  # Store original ID in payload
+            "content": content,
+            "created_at": created_at,
+            **(metadata or {}),
+        }
+        
+        # Handle tags as list of strings (replaced, so the caller's list is untouched)
+        tags = payload.get("tags")
+        if isinstance(tags, list):
+            payload["tags"] = [str(tag) for tag in tags]
+        
+        return payload
+    
+    def _build_search_params(self, top_k: int) -> Optional[SearchParams]:
+        """
+        Build the default SearchParams for a top_k search.
+        
+        indexed_only is deliberately left off: it would hide points in
+        segments that aren't indexed yet (small collections, or during
+        bulk_load()).
+        """
+        if self.hnsw_ef is None and self._quantization_params is None:
+            return None
+        
+        return SearchParams(
+            hnsw_ef=max(self.hnsw_ef, 4 * top_k) if self.hnsw_ef is not None else None,
+            exact=False,
+            quantization=self._quantization_params,
+        )
     
     async def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[np.ndarray, List[float]],
         top_k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        search_params: Optional[SearchParams] = None,
+        projection: Optional[List[str]] = None
     ) -> List[SearchResult]:
         """
         Find most similar documents to query using vector similarity.
         
         Args:
-            query_embedding: Vector representation of the query
+            query_embedding: Vector representation of the query (a float32
+                             NumPy vector is sent without a Python list copy)
             top_k: Number of results to return
             filter_metadata: Optional filters (e.g., {"category": "focus_tips"})
+            search_params: Override the store's default SearchParams
+                           (e.g. SearchParams(exact=True) for a brute-force check)
+            projection: Payload fields to return (None = all). E.g. ["category"]
+                        skips the document text when only IDs, scores and
+                        some metadata are needed; content is then "".
             
         Returns:
             List of SearchResult objects, sorted by relevance (highest score first)
@@ -263,59 +746,18 @@ class QdrantVectorStore(BaseVectorStore):
             )
             ```
         """
-        # Build Qdrant filter from metadata
-        qdrant_filter = None
-        if filter_metadata:
-            conditions = []
-            for key, value in filter_metadata.items():
-                conditions.append(
-                    FieldCondition(
-                        key=key,
-                        match=MatchValue(value=value),
-                    )
-                )
-            
-            if conditions:
-                qdrant_filter = Filter(must=conditions)
-        
         # Perform vector search
         search_results = await self.client.query_points(
             collection_name=self.collection_name,
             query=query_embedding,
             limit=top_k,
-            query_filter=qdrant_filter,
-            with_payload=True,
+            query_filter=self._build_filter(filter_metadata),
+            search_params=search_params or self._build_search_params(top_k),
+            with_payload=self._payload_selector(projection),
             with_vectors=False,  # Don't return vectors (save bandwidth)
         )
         
-        # Convert Qdrant results to SearchResult objects
-        results = []
-        for rank, point in enumerate(search_results.points):
-            # Extract payload
-            payload = point.payload.copy() if point.payload else {}
-            document_id = payload.pop("document_id", str(point.id))  # Use original ID
-            content = payload.pop("content", "")
-            created_at = payload.pop("created_at", None)
-            
-            # Remaining fields are metadata
-            metadata = payload.copy()
-            if created_at:
-                metadata["created_at"] = created_at
-            
-            document = Document(
-                id=document_id,  # Return original document ID
-                content=content,
-                embedding=None,  # Don't return embeddings (large)
-                metadata=metadata,
-            )
-            
-            results.append(
-                SearchResult(
-                    document=document,
-                    score=point.score if hasattr(point, 'score') and point.score else 1.0,
-                    rank=rank,
-                )
-            )
+        results = self._to_search_results(search_results.points)
         
         logger.info(
             f"Search returned {len(results)} results "
@@ -324,54 +766,327 @@ class QdrantVectorStore(BaseVectorStore):
         
         return results
     
-    async def delete_by_id(self, document_id: str) -> bool:
+    async def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Run several similarity searches in a single Qdrant request.
+        
+        Args:
+            query_embeddings: One vector per query
+            top_k: Number of results per query
+            filter_metadata: Optional filters shared by all queries
+            
+        Returns:
+            One list of SearchResult objects per query, in input order
+        """
+        return await self.search_many([
+            (embedding, top_k, filter_metadata) for embedding in query_embeddings
+        ])
+    
+    async def search_many(
+        self,
+        requests: Sequence[Tuple[Union[np.ndarray, Sequence[float]], int, Optional[Dict[str, Any]]]]
+    ) -> List[List[SearchResult]]:
+        """
+        Run independent searches, each with its own top_k and filters, in
+        a single Qdrant request.
+        
+        Args:
+            requests: (query_embedding, top_k, filter_metadata) per search
+            
+        Returns:
+            One list of SearchResult objects per request, in input order
+            
+        Example:
+            ```python
+            mine, tips = await store.search_many([
+                (query_embedding, 5, {"user_id": "user-123"}),
+                (query_embedding, 5, {"category": "focus_tips"}),
+            ])
+            ```
+        """
+        if len(requests) == 0:
+            return []
+        
+        query_requests = [
+            QueryRequest(
+                query=np.asarray(embedding, dtype=float).tolist(),
+                limit=top_k,
+                filter=self._build_filter(filter_metadata),
+                params=self._build_search_params(top_k),
+                with_payload=True,
+                with_vector=False,
+            )
+            for embedding, top_k, filter_metadata in requests
+        ]
+        
+        responses = await self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=query_requests,
+        )
+        
+        logger.info(f"Batch search returned results for {len(responses)} queries")
+        
+        return [self._to_search_results(response.points) for response in responses]
+    
+    @staticmethod
+    def _payload_selector(projection: Optional[List[str]]) -> Union[bool, PayloadSelectorInclude]:
+        """
+        Map a payload projection to Qdrant's with_payload argument.
+        
+        document_id is always included so results keep their original IDs.
+        """
+        if projection is None:
+            return True
+        return PayloadSelectorInclude(include=["document_id", *projection])
+    
+    @staticmethod
+    def _build_filter(filter_metadata: Optional[Dict[str, Any]]) -> Optional[Filter]:
+        """
+        Build a Qdrant filter from metadata.
+        
+        Every key must match: scalar values exactly, list/tuple/set values
+        by any element (e.g. {"user_id": ["user-1", "user-2"]}).
+        """
+        if not filter_metadata:
+            return None
+        
+        # Freeze into a hashable key so repeated filters (the same user or
+        # category on every request) reuse one Filter object
+        items = tuple(
+            (key, _freeze_value(value)) for key, value in filter_metadata.items()
+        )
+        if any(frozen is None for _, frozen in items):
+            return Filter(must=[
+                FieldCondition(key=key, match=_field_match(value))
+                for key, value in filter_metadata.items()
+            ])
+        return _cached_filter(items)
+    
+    async def search_stream(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[SearchResult]:
+        """
+        Yield search results best-first, converting each point lazily.
+        
+        Qdrant returns the scored points in one response, but Documents
+        are only built for the results the caller actually consumes, so
+        `async for ...: break` after the first hit skips the rest.
+        
+        Args:
+            query_embedding: Vector representation of the query
+            top_k: Maximum number of results
+            filter_metadata: Optional filters (e.g., {"category": "focus_tips"})
+        """
+        response = await self.client.query_points(
+            collection_name=self.collection_name,
+            query=query_embedding,
+            limit=top_k,
+            query_filter=self._build_filter(filter_metadata),
+            search_params=self._build_search_params(top_k),
+            with_payload=True,
+            with_vectors=False,
+        )
+        for rank, point in enumerate(response.points):
+            yield self._to_search_result(point, rank)
+    
+    @staticmethod
+    def _to_search_results(points: Sequence[Any]) -> List[SearchResult]:
+        """
+        Convert scored Qdrant points to SearchResult objects.
+        """
+        return [
+            QdrantVectorStore._to_search_result(point, rank)
+            for rank, point in enumerate(points)
+        ]
+    
+    @staticmethod
+    def _to_search_result(point: Any, rank: int) -> SearchResult:
+        """
+        Convert one scored Qdrant point to a SearchResult.
+        """
+        # Read the payload without copying or mutating the client's dict;
+        # everything except the ID and content (created_at included) is metadata
+        payload = point.payload or {}
+        document_id = payload.get("document_id", str(point.id))  # Use original ID
+        content = payload.get("content", "")
+        metadata = {
+            key: value for key, value in payload.items()
+            if key != "content" and key != "document_id"
+        }
+        
+        document = Document(
+            id=document_id,  # Return original document ID
+            content=content,
+            embedding=None,  # Don't return embeddings (large)
+            metadata=metadata,
+        )
+        
+        return SearchResult(
+            document=document,
+            score=point.score if hasattr(point, 'score') and point.score else 1.0,
+            rank=rank,
+        )
+    
+    async def delete_by_id(self, document_id: str, check_exists: bool = False) -> bool:
         """
         Remove a document from the store.
         
+        Qdrant's delete doesn't report whether the point existed, so by
+        default an unknown id also returns True. With check_exists=True the
+        point is counted first; that is a second round trip, and another
+        client can still delete the point between the count and the delete.
+        
         Args:
             document_id: Unique identifier of document to delete
+            check_exists: Return False (and skip the delete) if the document
+                          isn't in the collection
             
         Returns:
-            True if deleted, False if not found
+            True if the delete was applied, False if not found (check_exists
+            only) or on a Qdrant error
         """
-        try:
-            # Convert ID to UUID format
-            point_id = _ensure_uuid(document_id)
+        if check_exists:
+            try:
+                found = await self.client.count(
+                    collection_name=self.collection_name,
+                    count_filter=Filter(must=[HasIdCondition(has_id=[_ensure_uuid(document_id)])]),
+                    exact=True,
+                )
+            except UnexpectedResponse as e:
+                logger.warning(f"Failed to look up document {document_id}: {e}")
+                return False
+            if found.count == 0:
+                logger.info(f"Document {document_id} not found in '{self.collection_name}'")
+                return False
+        return await self.delete_by_ids([document_id])
+    
+    async def delete_by_ids(self, document_ids: List[str], wait: bool = True) -> bool:
+        """
+        Remove several documents in a single request.
+        
+        Args:
+            document_ids: Unique identifiers of documents to delete
+            wait: Block until Qdrant has applied the delete
             
-            # Attempt to delete point by ID
-            await self.client.delete(
+        Returns:
+            True if the delete was accepted, False on a Qdrant error or
+            if Qdrant didn't apply it
+        """
+        if not document_ids:
+            return True
+        
+        try:
+            result = await self.client.delete(
                 collection_name=self.collection_name,
-                points_selector=[point_id],
+                points_selector=PointIdsList(
+                    points=[_ensure_uuid(doc_id) for doc_id in document_ids]
+                ),
+                wait=wait,
             )
-            logger.info(f"Deleted document '{document_id}'")
+            if result.status not in (UpdateStatus.ACKNOWLEDGED, UpdateStatus.COMPLETED):
+                logger.warning(f"Delete of {document_ids} not applied: {result.status}")
+                return False
+            logger.info(f"Deleted {len(document_ids)} document(s) from '{self.collection_name}'")
             return True
             
         except UnexpectedResponse as e:
-            logger.warning(f"Failed to delete document '{document_id}': {e}")
+            logger.warning(f"Failed to delete documents {document_ids}: {e}")
             return False
     
-    async def clear(self) -> None:
+    async def delete_by_filter(self, filter_metadata: Dict[str, Any], wait: bool = True) -> None:
+        """
+        Remove every document matching a metadata filter, server-side.
+        
+        Args:
+            filter_metadata: Filters as for search(); list values match any
+                             element (e.g. {"session_id": ["s-1", "s-2"]})
+            wait: Block until Qdrant has applied the delete
+            
+        Raises:
+            ValueError: If filter_metadata is empty (use clear() instead)
+        """
+        if not filter_metadata:
+            raise ValueError("filter_metadata must not be empty; use clear() to remove everything")
+        
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=self._build_filter(filter_metadata)),
+            wait=wait,
+        )
+        logger.info(f"Deleted documents matching {filter_metadata} from '{self.collection_name}'")
+    
+    async def clear(self, recreate: bool = False) -> None:
         """
         Remove all documents from the store.
         
-        WARNING: This deletes the entire collection and recreates it.
-        Use with caution!
+        By default points are purged server-side and the collection's
+        vector config and payload indexes are kept, so nothing has to be
+        rebuilt. WARNING: recreate=True drops the entire collection and
+        creates it again (e.g. to apply a changed vector config or recover
+        a broken collection). Use with caution!
+        
+        Args:
+            recreate: Drop and recreate the collection instead of purging points
         """
         try:
+            if not recreate:
+                # An empty filter matches every point
+                await self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=FilterSelector(filter=Filter(must=[])),
+                    wait=True,
+                )
+                logger.info(f"Removed all points from '{self.collection_name}'")
+                return
+            
             # Delete collection
             await self.client.delete_collection(
                 collection_name=self.collection_name
             )
+            self._forget_collection()
             logger.info(f"Deleted collection '{self.collection_name}'")
             
-            # Recreate empty collection
-            await self.initialize()
+            # Recreate empty collection (known not to exist now)
+            await self._create_collection()
+            _initialized_collections[self._client_key].add(self._collection_config())
             logger.info(f"Recreated empty collection '{self.collection_name}'")
             
         except UnexpectedResponse as e:
             logger.error(f"Failed to clear collection: {e}")
             raise
     
+    async def reset_and_populate(
+        self,
+        documents: List[Document],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        batch_size: int = 256
+    ) -> None:
+        """
+        Replace the collection contents with documents in one pass.
+        
+        Equivalent to initialize() + clear() + add_documents(), minus the
+        existence checks and per-document conversion: drop,
+        create, then one batched upload. Handy for tests and full rebuilds.
+        
+        Args:
+            documents: List of Document objects with content and metadata
+            embeddings: (N, D) embedding matrix aligned with documents
+            batch_size: Points per upload request
+        """
+        await self.client.delete_collection(collection_name=self.collection_name)
+        self._forget_collection()
+        await self._create_collection()
+        _initialized_collections[self._client_key].add(self._collection_config())
+        await self.upload_documents(documents, embeddings, batch_size=batch_size)
+    
     async def get_collection_info(self) -> Dict[str, Any]:
         """
         Get information about the collection (points count, config, etc.).
@@ -398,9 +1113,16 @@ class QdrantVectorStore(BaseVectorStore):
     
     async def close(self) -> None:
         """
-        Close the Qdrant client connection.
+        Release the Qdrant client connection.
         
-        Call this during application shutdown.
+        The shared client is closed once the last store using it is
+        closed. Call this during application shutdown.
         """
-        await self.client.close()
-        logger.info("Closed QdrantVectorStore connection")
+        if self._client_key is None:
+            return
+        
+        client = _release_client(self._client_key)
+        self._client_key = None
+        if client is not None:
+            await client.close()
+            logger.info("Closed QdrantVectorStore connection")
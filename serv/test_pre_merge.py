@@ -4,8 +4,13 @@ Tests all critical components before merging hotfix branch.
 """
 
 import sys
+import time
 import asyncio
 
+# Heavy ML/vector-store packages that must stay out of app startup
+# (RAGService imports them lazily on first use)
+HEAVY_MODULES = ("torch", "sentence_transformers", "qdrant_client", "huggingface_hub")
+
 print("="*70)
 print("PRE-MERGE VERIFICATION TEST")
 print("="*70)
@@ -13,8 +18,10 @@ print("="*70)
 # Test 1: Import main FastAPI app
 print("\n[1/6] Testing FastAPI app import...")
 try:
+    start = time.perf_counter()
     from main import app
-    print("✅ FastAPI app imports successfully")
+    import_seconds = time.perf_counter() - start
+    print(f"✅ FastAPI app imports successfully ({import_seconds:.2f}s)")
     print(f"   App title: {app.title}")
     print(f"   Registered routes: {len(app.routes)}")
 except Exception as e:
@@ -79,6 +86,16 @@ try:
     from api.routes.rag import router as rag_router
     from api.routes.conversation import router as conversation_router
     print("✅ All route modules imported successfully")
+    
+    # Everything above ran in this one process, so sys.modules shows
+    # exactly what startup pulled in
+    eager = [name for name in HEAVY_MODULES if name in sys.modules]
+    if eager:
+        raise RuntimeError(
+            f"heavy modules imported at startup: {', '.join(eager)} "
+            f"(profile with: python -X importtime -c \"import main\")"
+        )
+    print("   Lazy loading verified (no ML/vector-store modules imported)")
     routers = [
         auth_router, users_router, sessions_router, garden_router,
         stats_router, distraction_router, team_router, team_message_router,
@@ -4,8 +4,11 @@ Tests that FIRST request gets instant fallback (not blocked by initialization).
 """
 
 import asyncio
+import logging
 import sys
 
+logger = logging.getLogger(__name__)
+
 print("="*70)
 print("RAG FALLBACK TEST - First Request Gets Instant Response")
 print("="*70)
@@ -79,9 +82,7 @@ async def test_fallback():
             print("   → RAG already initialized, would use full retrieval")
             
     except Exception as e:
-        print(f"❌ Fallback test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Fallback test failed: {e}")
         return False
     
     print("\n[4/4] Summary of behavior...")
@@ -0,0 +1,27 @@
+"""
+Test Doubles Shared Across Test Modules
+
+Deterministic stand-ins for components that would otherwise need a model
+download or network access.
+"""
+
+from typing import List
+
+from rag.embeddings.base_embedder import BaseEmbedder
+
+
+class KeywordEmbedder(BaseEmbedder):
+    """Deterministic embedder: one dimension per known keyword."""
+
+    KEYWORDS = ["focus", "phone", "sleep", "pomodoro"]
+
+    async def embed_text(self, text: str) -> List[float]:
+        lowered = text.lower()
+        return [float(keyword in lowered) for keyword in self.KEYWORDS]
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [await self.embed_text(text) for text in texts]
+
+    @property
+    def dimension(self) -> int:
+        return len(self.KEYWORDS)
@@ -0,0 +1,94 @@
+"""
+Tests for Persistent Embedding Cache
+
+Tests hit/miss lookups, persistence across instances, model isolation
+and the cached encode path of SentenceTransformerEmbedder.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from rag.embeddings import sentence_transformer_embedder
+from rag.embeddings.embedding_cache import EmbeddingCache
+from rag.embeddings.sentence_transformer_embedder import SentenceTransformerEmbedder
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "embeddings.sqlite"
+
+
+class TestEmbeddingCache:
+    """Test content-hash keyed embedding storage."""
+
+    def test_round_trip_returns_hits_only(self, cache_path):
+        cache = EmbeddingCache(cache_path, model_name="m")
+        cache.put_many(["a", "c"], np.array([[1, 2], [3, 4]], dtype=np.float32))
+
+        hits = cache.get_many(["a", "b", "c"])
+
+        assert sorted(hits) == [0, 2]
+        assert np.array_equal(hits[2], np.array([3, 4], dtype=np.float32))
+        assert hits[0].dtype == np.float32
+
+    def test_persists_across_instances(self, cache_path):
+        cache = EmbeddingCache(cache_path, model_name="m")
+        cache.put_many(["a"], [[0.5, 0.25]])
+        cache.close()
+
+        reopened = EmbeddingCache(cache_path, model_name="m")
+
+        assert len(reopened) == 1
+        assert np.array_equal(reopened.get_many(["a"])[0], np.array([0.5, 0.25], dtype=np.float32))
+
+    def test_model_name_isolates_entries(self, cache_path):
+        """Vectors from one model must never be served for another."""
+        EmbeddingCache(cache_path, model_name="m1").put_many(["a"], [[1.0]])
+
+        assert EmbeddingCache(cache_path, model_name="m2").get_many(["a"]) == {}
+
+    def test_empty_inputs(self, cache_path):
+        cache = EmbeddingCache(cache_path, model_name="m")
+        cache.put_many([], [])
+
+        assert cache.get_many([]) == {}
+        assert len(cache) == 0
+
+
+class FakeModel:
+    """Stands in for SentenceTransformer: records what it encodes and where."""
+
+    device = "cpu"
+
+    def __init__(self):
+        self.encoded = []
+        self.threads = set()
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        self.threads.add(threading.get_ident())
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+@pytest.mark.asyncio
+class TestEmbedderCache:
+    """Test that cached texts skip the model."""
+
+    async def test_only_misses_are_encoded(self, cache_path, monkeypatch):
+        # No model weights needed: the constructor gets the fake model
+        model = FakeModel()
+        monkeypatch.setattr(sentence_transformer_embedder, "_load_model", lambda *args: model)
+        embedder = SentenceTransformerEmbedder(cache_path=cache_path)
+
+        first = await embedder.embed_batch(["aa", "b"], return_numpy=True)
+        second = await embedder.embed_batch(["b", "ccc", "aa"], return_numpy=True)
+
+        assert model.encoded == ["aa", "b", "ccc"]
+        assert threading.get_ident() not in model.threads  # Off the event loop
+        assert np.array_equal(first, [[2, 1], [1, 1]])
+        assert np.array_equal(second, [[1, 1], [3, 1], [2, 1]])
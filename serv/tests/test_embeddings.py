@@ -0,0 +1,60 @@
+"""
+Tests for Sentence Transformer Embedder
+
+Tests output shape, normalization and ordering of local embeddings.
+Skipped when the model weights are not already cached, so a cold
+machine never pays for a model download during the test run.
+"""
+
+import numpy as np
+import pytest
+
+from rag.embeddings.sentence_transformer_embedder import (
+    SentenceTransformerEmbedder,
+    is_model_cached,
+)
+
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+pytestmark = pytest.mark.skipif(
+    not is_model_cached(MODEL_NAME),
+    reason=f"{MODEL_NAME} weights not in local Hugging Face cache",
+)
+
+
+@pytest.fixture(scope="module")
+def embedder():
+    """Load the model once and share it across the module."""
+    return SentenceTransformerEmbedder(model_name=MODEL_NAME, device="cpu")
+
+
+@pytest.mark.asyncio
+class TestSentenceTransformerEmbedder:
+    """Test local embedding generation."""
+
+    async def test_numpy_output_is_normalized(self, embedder):
+        """NumPy output should be (N, dim) with unit-length rows."""
+        texts = ["Pomodoro", "Turn off phone notifications during deep work"]
+
+        vectors = await embedder.embed_batch(texts, return_numpy=True)
+
+        assert vectors.shape == (2, embedder.dimension)
+        assert vectors.dtype.kind == "f"
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+    async def test_list_output_matches_numpy(self, embedder):
+        """List output should hold the same values in the same order."""
+        texts = ["a much longer sentence about focus and breaks", "short", "medium text"]
+
+        as_list = await embedder.embed_batch(texts)
+        as_numpy = await embedder.embed_batch(texts, return_numpy=True)
+
+        assert len(as_list) == 3
+        assert all(isinstance(x, float) for x in as_list[0])
+        assert np.allclose(np.asarray(as_list), as_numpy, atol=1e-6)
+
+    async def test_empty_input(self, embedder):
+        """Empty input should return an empty result of the right type."""
+        assert await embedder.embed_batch([]) == []
+        assert (await embedder.embed_batch([], return_numpy=True)).shape == (0, embedder.dimension)
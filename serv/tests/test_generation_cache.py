@@ -0,0 +1,141 @@
+"""
+Tests for LLM Response Caches
+
+Tests semantic cache hits, context isolation and eviction.
+"""
+
+import numpy as np
+import pytest
+
+from rag.generation.cache import ExactCache, SemanticCache, fingerprint
+from tests.fakes import KeywordEmbedder
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(KeywordEmbedder(), threshold=0.9, max_entries=2)
+
+
+class TestFingerprint:
+    """Test content fingerprints."""
+
+    def test_stable_and_order_sensitive(self):
+        assert fingerprint("a", "b") == fingerprint("a", "b")
+        assert fingerprint("ab", "c") != fingerprint("a", "bc")
+        assert fingerprint("a", "b") != fingerprint("b", "a")
+
+
+class TestExactCache:
+    """Test exact-match LRU cache."""
+
+    def test_lru_eviction(self):
+        """Least recently used entry should be evicted first."""
+        cache = ExactCache(max_entries=2)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        assert cache.get(1) == "one"  # 1 is now most recent
+
+        cache.put(3, "three")
+
+        assert cache.get(2) is None
+        assert cache.get(1) == "one"
+        assert cache.get(3) == "three"
+        assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+class TestSemanticCache:
+    """Test semantic response cache."""
+
+    async def test_rephrased_query_hits(self, cache):
+        """A similar query over the same context should reuse the answer."""
+        context_key = fingerprint("doc")
+        cache.store(await cache.embed("How to focus?"), context_key, "Use Pomodoro")
+
+        hit = cache.lookup(await cache.embed("How can I FOCUS better"), context_key)
+
+        assert hit == "Use Pomodoro"
+        assert cache.hits == 1
+
+    async def test_different_context_misses(self, cache):
+        """Same query with a different context must not be served from cache."""
+        embedding = await cache.embed("How to focus?")
+        cache.store(embedding, fingerprint("user A stats"), "A's answer")
+
+        assert cache.lookup(embedding, fingerprint("user B stats")) is None
+
+    async def test_dissimilar_query_misses(self, cache):
+        context_key = fingerprint("doc")
+        cache.store(await cache.embed("How to focus?"), context_key, "Use Pomodoro")
+
+        assert cache.lookup(await cache.embed("Phone distractions"), context_key) is None
+
+    async def test_fifo_eviction(self, cache):
+        """Oldest entry should be overwritten once the cache is full."""
+        context_key = fingerprint("doc")
+        for query in ["focus", "phone", "sleep"]:
+            cache.store(await cache.embed(query), context_key, query)
+
+        assert len(cache) == 2
+        assert cache.lookup(await cache.embed("focus"), context_key) is None
+        assert cache.lookup(await cache.embed("sleep"), context_key) == "sleep"
+
+    async def test_embed_is_normalized(self, cache):
+        embedding = await cache.embed("focus on pomodoro")
+
+        assert np.linalg.norm(embedding) == pytest.approx(1.0)
+
+    async def test_query_embedding_is_memoized(self, cache):
+        """Embedding the same query twice should call the embedder once."""
+        calls = []
+        embed_text = cache.embedder.embed_text
+
+        async def counting_embed_text(text):
+            calls.append(text)
+            return await embed_text(text)
+
+        cache.embedder.embed_text = counting_embed_text
+
+        first = await cache.embed("How to focus?")
+        second = await cache.embed("How to focus?")
+
+        assert calls == ["How to focus?"]
+        assert np.array_equal(first, second)
+
+    async def test_persisted_responses_survive_restart(self, tmp_path):
+        """A new cache on the same file should serve answers stored before."""
+        path = tmp_path / "llm_cache.sqlite"
+        context_key = fingerprint("doc")
+        first = SemanticCache(KeywordEmbedder(), threshold=0.9, max_entries=2, path=path)
+        for query in ["focus", "phone", "sleep"]:
+            first.store(await first.embed(query), context_key, query)
+        first.close()
+
+        restarted = SemanticCache(KeywordEmbedder(), threshold=0.9, max_entries=2, path=path)
+
+        assert len(restarted) == 2
+        assert restarted.lookup(await restarted.embed("focus"), context_key) is None
+        assert restarted.lookup(await restarted.embed("sleep"), context_key) == "sleep"
+        restarted.close()
+
+    async def test_trim_is_per_model(self, tmp_path):
+        """One model's writes must not evict another model's rows."""
+        path = tmp_path / "llm_cache.sqlite"
+        context_key = fingerprint("doc")
+        other_embedder = KeywordEmbedder()
+        other_embedder.model_name = "other-model"
+
+        other = SemanticCache(other_embedder, threshold=0.9, max_entries=2, path=path)
+        other.store(await other.embed("focus"), context_key, "other focus")
+        other.close()
+
+        first = SemanticCache(KeywordEmbedder(), threshold=0.9, max_entries=2, path=path)
+        for query in ["phone", "sleep", "pomodoro"]:
+            first.store(await first.embed(query), context_key, query)
+        first.close()
+
+        reloaded = SemanticCache(other_embedder, threshold=0.9, max_entries=2, path=path)
+
+        assert len(reloaded) == 1
+        assert reloaded.lookup(await reloaded.embed("focus"), context_key) == "other focus"
+        reloaded.close()
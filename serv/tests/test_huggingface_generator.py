@@ -0,0 +1,294 @@
+"""
+Tests for HuggingFace Generator
+
+Uses a fake AsyncInferenceClient so no network access is needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from huggingface_hub.utils import HfHubHTTPError
+
+from rag.generation.base_generator import GenerationConfig
+from rag.generation import huggingface_generator
+from rag.generation.cache import SemanticCache
+from rag.generation.huggingface_generator import (
+    DOCUMENT_OVERHEAD_TOKENS,
+    HuggingFaceGenerator,
+    close_clients,
+)
+from tests.fakes import KeywordEmbedder
+
+
+class FakeClient:
+    """Echoes the last prompt line back and records peak concurrency."""
+
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak = 0
+
+    async def chat_completion(self, messages, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        prompt = messages[0]["content"]
+        if self.fail_on and self.fail_on in prompt:
+            raise ValueError("boom")
+        question = prompt.split("Question: ")[1].split("\n")[0]
+        message = SimpleNamespace(content=f"answer to {question}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+CONFIG = GenerationConfig()
+
+
+@pytest.fixture(autouse=True)
+def isolated_clients(monkeypatch):
+    """Give each test its own shared-client cache so no clients leak between tests."""
+    monkeypatch.setattr(huggingface_generator, "_clients", {})
+
+
+@pytest.fixture
+def generator():
+    generator = HuggingFaceGenerator(api_key="hf_test")
+    generator.client = FakeClient()
+    return generator
+
+
+@pytest.mark.asyncio
+class TestGenerateBatch:
+    """Test concurrent batch generation."""
+
+    async def test_results_in_input_order(self, generator):
+        queries = [f"q{i}" for i in range(5)]
+
+        results = await generator.generate_batch(queries, [["doc"]] * 5)
+
+        assert results == [f"answer to q{i}" for i in range(5)]
+
+    async def test_respects_max_concurrency(self, generator):
+        await generator.generate_batch(
+            [f"q{i}" for i in range(10)], [[]] * 10, max_concurrency=3
+        )
+
+        assert generator.client.peak == 3
+
+    async def test_failure_is_isolated(self, generator):
+        """One failing query should not discard the other results."""
+        generator.client.fail_on = "bad"
+
+        results = await generator.generate_batch(["good", "bad"], [[], []])
+
+        assert results[0] == "answer to good"
+        assert isinstance(results[1], RuntimeError)
+
+    async def test_length_mismatch_raises(self, generator):
+        with pytest.raises(ValueError):
+            await generator.generate_batch(["q1", "q2"], [[]])
+
+
+class FakeStreamClient:
+    """Fails to open the stream `loading_attempts` times with 503, then streams."""
+
+    def __init__(self, tokens, loading_attempts=0):
+        self.tokens = tokens
+        self.loading_attempts = loading_attempts
+        self.calls = 0
+
+    async def chat_completion(self, messages, stream=False, **kwargs):
+        self.calls += 1
+        if self.calls <= self.loading_attempts:
+            response = httpx.Response(503, request=httpx.Request("POST", "http://hf"))
+            raise HfHubHTTPError("Model is loading", response=response)
+        return self._chunks()
+
+    async def _chunks(self):
+        for token in self.tokens:
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+@pytest.mark.asyncio
+class TestGenerateStream:
+    """Test streaming generation."""
+
+    async def test_streams_tokens(self, generator):
+        generator.client = FakeStreamClient(["Use ", None, "Pomodoro"])
+
+        chunks = [chunk async for chunk in generator.generate_stream("q", [])]
+
+        assert chunks == ["Use ", "Pomodoro"]
+
+    async def test_retries_model_loading_before_first_token(self, generator, monkeypatch):
+        async def no_sleep(_):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+        generator.client = FakeStreamClient(["ok"], loading_attempts=2)
+
+        chunks = [chunk async for chunk in generator.generate_stream("q", [])]
+
+        assert chunks == ["ok"]
+        assert generator.client.calls == 3
+
+
+class ColdStartClient:
+    """Returns 503 until `ready_at` calls have been made, then answers."""
+
+    def __init__(self, ready_at):
+        self.ready_at = ready_at
+        self.calls = 0
+
+    async def chat_completion(self, messages, **kwargs):
+        self.calls += 1
+        if self.calls <= self.ready_at:
+            response = httpx.Response(503, request=httpx.Request("POST", "http://hf"))
+            raise HfHubHTTPError("Model is loading", response=response)
+        message = SimpleNamespace(content="ready")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.mark.asyncio
+class TestModelLoading:
+    """Test shared backoff while the model cold-loads."""
+
+    async def test_concurrent_callers_share_one_wait(self, generator):
+        generator.client = ColdStartClient(ready_at=5)
+        generator._backoff_caps = [0.05] * len(generator._backoff_caps)
+
+        results = await generator.generate_batch([f"q{i}" for i in range(5)], [[]] * 5)
+
+        assert results == ["ready"] * 5
+        # All five 503s landed in one shared wait, then each retried once
+        assert generator.client.calls == 10
+
+
+class TestBackoff:
+    """Test retry backoff schedule."""
+
+    def test_schedule_is_capped(self):
+        generator = HuggingFaceGenerator(api_key="hf_test", max_retries=8)
+
+        assert generator._backoff_caps == [2.0, 4.0, 8.0, 16.0] + [20.0] * 5
+        for attempt, cap in enumerate(generator._backoff_caps):
+            assert 0.0 <= generator._backoff_delay(attempt) <= cap
+
+    def test_jitter_is_drawn_per_sleep(self):
+        """The same instance must not hand every caller the same delay."""
+        generator = HuggingFaceGenerator(api_key="hf_test")
+
+        assert len({generator._backoff_delay(1) for _ in range(10)}) > 1
+
+
+@pytest.mark.asyncio
+class TestSharedClient:
+    """Test inference client pooling."""
+
+    async def test_same_token_shares_client(self):
+        first = HuggingFaceGenerator(api_key="hf_shared")
+        second = HuggingFaceGenerator(api_key="hf_shared", model="other/model")
+        other = HuggingFaceGenerator(api_key="hf_other")
+
+        assert first.client is second.client
+        assert first.client is not other.client
+
+        await close_clients()
+
+        assert HuggingFaceGenerator(api_key="hf_shared").client is not first.client
+
+
+@pytest.mark.asyncio
+class TestContextBudget:
+    """Test context truncation to a token budget."""
+
+    @staticmethod
+    def budgeted_generator(doc_tokens):
+        """Generator whose window leaves doc_tokens for documents after overhead."""
+        generator = HuggingFaceGenerator(api_key="hf_test", max_context_tokens=1)
+        generator._tokenizer_loaded = True  # Use the chars/token estimate
+        overhead = generator._count_tokens(generator._format_prompt("q", [], "SYS"))
+        generator.max_context_tokens = overhead + CONFIG.max_tokens + doc_tokens
+        return generator
+
+    async def fit(self, generator, docs):
+        return await generator._fit_context(docs, "q", "SYS", CONFIG)
+
+    async def test_keeps_top_documents_that_fit(self):
+        """Budget excludes prompt overhead and the reply reserve."""
+        generator = self.budgeted_generator(2 * DOCUMENT_OVERHEAD_TOKENS + 5)
+        docs = ["a" * 8, "b" * 12]  # 2 + 3 tokens
+
+        assert await self.fit(generator, docs) == docs
+        assert await self.fit(generator, docs + ["c"]) == docs
+
+    async def test_truncates_first_overflowing_document(self):
+        generator = self.budgeted_generator(2 * DOCUMENT_OVERHEAD_TOKENS + 3)
+
+        assert await self.fit(generator, ["a" * 8, "b" * 40]) == ["a" * 8, "b" * 4]
+
+    async def test_never_empties_non_empty_context(self):
+        """A rendered prompt larger than the window is truncated, not dropped."""
+        generator = self.budgeted_generator(DOCUMENT_OVERHEAD_TOKENS + 10)
+
+        assert await self.fit(generator, ["x" * 1000]) == ["x" * 40]
+
+        generator.max_context_tokens = 1
+        assert await self.fit(generator, ["x" * 1000]) == ["x" * 1000]
+
+    async def test_unlimited_by_default(self, generator):
+        docs = ["x" * 10000] * 3
+
+        assert await generator._fit_context(docs, "q", None, CONFIG) is docs
+
+    async def test_token_lengths_are_memoized(self):
+        generator = self.budgeted_generator(100)
+
+        await self.fit(generator, ["doc"] * 3)
+
+        assert generator._token_length.cache_info().hits == 2
+
+
+@pytest.mark.asyncio
+class TestSemanticCacheKey:
+    """Test which inputs the semantic cache is keyed on."""
+
+    async def test_cache_context_ignores_rendered_prompt(self, generator):
+        """A rephrased query inside a rendered prompt should still hit."""
+        generator.semantic_cache = SemanticCache(KeywordEmbedder(), threshold=0.9)
+        calls = []
+        chat_completion = generator.client.chat_completion
+
+        async def counting_chat_completion(messages, **kwargs):
+            calls.append(messages)
+            return await chat_completion(messages, **kwargs)
+
+        generator.client.chat_completion = counting_chat_completion
+
+        first = await generator.generate(
+            "How to focus?", ["SYS\nUser Message: How to focus?"], "", cache_context=["tips"]
+        )
+        second = await generator.generate(
+            "how can I focus", ["SYS\nUser Message: how can I focus"], "", cache_context=["tips"]
+        )
+
+        assert second == first
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+class TestResponseParsing:
+    """Test extraction of text from chat completion responses."""
+
+    async def test_empty_choices_raises(self, generator):
+        async def empty_response(messages, **kwargs):
+            return SimpleNamespace(choices=[])
+
+        generator.client.chat_completion = empty_response
+
+        with pytest.raises(RuntimeError, match="Unexpected response shape"):
+            await generator.generate("q", [])
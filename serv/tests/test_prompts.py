@@ -0,0 +1,177 @@
+"""
+Tests for Prompt Builders
+
+Pins the exact prompt text produced by the builders so performance
+refactors of the string assembly cannot change what the LLM sees.
+"""
+
+import pytest
+
+from rag.generation import prompts
+from rag.generation.huggingface_generator import HuggingFaceGenerator
+
+
+CONVERSATION_SUFFIX = (
+    "Respond naturally, considering the conversation history above. Reference previous "
+    "messages when relevant (e.g., \"As we discussed earlier...\" or \"Building on what I "
+    "suggested...\"). Keep your response conversational and helpful."
+)
+
+
+class TestRagPrompts:
+    """Test knowledge-base prompt builders."""
+
+    def test_build_rag_prompt(self):
+        prompt = prompts.build_rag_prompt("Q?", ["d1", "d2"], system_prompt="SYS")
+
+        assert prompt == (
+            "SYS\n\nContext Documents:\nDocument 1: d1\n\nDocument 2: d2\n\n"
+            "User Question: Q?\n\n"
+            "Provide a helpful, concise answer based on the context above."
+        )
+
+    def test_build_rag_prompt_default_system_prompt(self):
+        prompt = prompts.build_rag_prompt("Q?", ["d1"])
+
+        assert prompt == (
+            prompts.PRODUCTIVITY_COACH_PROMPT
+            + "\n\nContext Documents:\nDocument 1: d1\n\n"
+            "User Question: Q?\n\n"
+            "Provide a helpful, concise answer based on the context above."
+        )
+
+    def test_build_conversation_aware_prompt(self):
+        history = [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "yo"},
+        ]
+
+        prompt = prompts.build_conversation_aware_prompt(
+            "Q?", ["d1"], history, system_prompt="SYS"
+        )
+
+        assert prompt == (
+            "SYS\n\n\nPrevious Conversation:\nUser: hi\nYou (Alex): yo\n\n\n"
+            "Knowledge Base Context:\nKnowledge Base Excerpt 1: d1\n\n"
+            "Current User Message: Q?\n\n" + CONVERSATION_SUFFIX
+        )
+
+    def test_build_conversation_aware_prompt_without_history(self):
+        prompt = prompts.build_conversation_aware_prompt("Q?", [], None, system_prompt="SYS")
+
+        assert prompt == (
+            "SYS\n\n\nKnowledge Base Context:\n\n\n"
+            "Current User Message: Q?\n\n" + CONVERSATION_SUFFIX
+        )
+
+    def test_conversation_history_window(self):
+        """Only the last HISTORY_WINDOW messages are included."""
+        history = [{"role": "user", "content": f"m{i}"} for i in range(10)]
+
+        prompt = prompts.build_conversation_aware_prompt("Q?", [], history, system_prompt="SYS")
+
+        assert "User: m3" not in prompt
+        assert "User: m4\n" in prompt and "User: m9\n" in prompt
+
+
+class TestStatsPrompts:
+    """Test stats/session prompt builders."""
+
+    def test_build_stats_analysis_prompt(self):
+        prompt = prompts.build_stats_analysis_prompt(
+            "Q?", {"username": "u", "last_7_days": {"avg_blink_rate": 12}}, ["t1"]
+        )
+
+        assert prompt == (
+            prompts.STATS_ANALYSIS_PROMPT + "\n\n"
+            "User Profile:\n- Username: u\n- Level: 1\n- Total XP: 0 points\n"
+            "- Current Streak: 0 days\n- Longest Streak: 0 days\n\n"
+            "Overall Performance:\n- Total Sessions: 0\n- Completed Sessions: 0\n"
+            "- Completion Rate: 0%\n- Total Focus Time: 0 minutes\n\n"
+            "Last 7 Days:\n- Sessions Started: 0\n- Sessions Completed: 0\n- Focus Minutes: 0\n"
+            "- Avg Blink Rate: 12 blinks/min (indicator of screen focus)\n\n\n\n"
+            "Relevant Productivity Tips:\nTip 1: t1\n\n\n"
+            "User Question: Q?\n\n"
+            "Provide a data-driven analysis with specific insights based on their stats. "
+            "Be encouraging and actionable."
+        )
+
+    def test_build_stats_analysis_prompt_without_recent_stats(self):
+        """Missing or null last_7_days should render zero defaults."""
+        for stats in ({"username": "u"}, {"username": "u", "last_7_days": None}):
+            prompt = prompts.build_stats_analysis_prompt("Q?", stats)
+
+            assert "- Sessions Started: 0\n- Sessions Completed: 0\n- Focus Minutes: 0\n\n" in prompt
+            assert "Avg Blink Rate" not in prompt
+
+    def test_build_session_summary_prompt(self):
+        prompt = prompts.build_session_summary_prompt(
+            {"duration": 600, "distractions": [{"type": "phone"}], "blink_rate": 15},
+            ["tip"],
+        )
+
+        assert prompt == (
+            "You are analyzing a completed focus session in FocusGuard.\n\n"
+            "Session Stats:\n- Duration: 10.0 minutes\n- Distractions detected: 1\n"
+            "- Blink rate: 15 blinks/min\n- Top distractions: phone\n\n"
+            "Relevant Productivity Tips:\n- tip\n\n"
+            "Task: Provide a brief, encouraging summary of this session with 2-3 specific "
+            "recommendations \nfor the next session based on the tips above. "
+            "Keep it under 100 words."
+        )
+
+    def test_build_progress_analysis_prompt(self):
+        prompt = prompts.build_progress_analysis_prompt(
+            {"total_sessions": 3, "avg_duration": 1500, "total_minutes": 75}, ["g1"], ["s1"]
+        )
+
+        assert prompt == (
+            "You are providing a weekly productivity report for a FocusGuard user.\n\n"
+            "This Week's Stats:\n- Total sessions: 3\n- Total focus time: 75 minutes\n"
+            "- Average session: 25.0 minutes\n\n"
+            "User's Goals:\n- g1\n\n"
+            "Relevant Strategies from Knowledge Base:\n- s1\n\n"
+            "Task: Provide a brief weekly summary highlighting progress toward goals and "
+            "suggest \none key strategy from the knowledge base to try next week. "
+            "Be specific and encouraging."
+        )
+
+
+class TestGreetings:
+    """Test canned greeting detection."""
+
+    @pytest.mark.parametrize("query", ["hi", "Hello!", "  hey there ", "good morning", "Hiii"])
+    def test_greetings_get_canned_response(self, query):
+        assert prompts.match_greeting(query) in prompts.GREETING_RESPONSES
+
+    @pytest.mark.parametrize("query", ["hi, how do I stop checking my phone?", "hello world program", "history"])
+    def test_real_questions_fall_through(self, query):
+        assert prompts.match_greeting(query) is None
+
+
+class TestGeneratorPromptFormat:
+    """Test the instruction-format prompt used by HuggingFaceGenerator."""
+
+    def test_format_prompt_default_system_prompt(self):
+        generator = HuggingFaceGenerator(api_key="hf_test")
+
+        prompt = generator._format_prompt("Q?", ["d1", "d2"])
+
+        assert prompt == (
+            "[INST] You are a focus and productivity coach. Provide concise, actionable "
+            "advice based on the context provided. Be empathetic and encouraging.\n\n"
+            "Context:\nDocument 1: d1\n\nDocument 2: d2\n\n"
+            "Question: Q?\n\n"
+            "Provide a helpful, concise answer based on the context above. [/INST]"
+        )
+
+    def test_format_prompt_custom_system_prompt(self):
+        generator = HuggingFaceGenerator(api_key="hf_test")
+
+        prompt = generator._format_prompt("Q?", ["d1"], "SYS")
+
+        assert prompt == (
+            "[INST] SYS\n\nContext:\nDocument 1: d1\n\n"
+            "Question: Q?\n\n"
+            "Provide a helpful, concise answer based on the context above. [/INST]"
+        )
@@ -0,0 +1,183 @@
+"""
+Tests for Qdrant Vector Store
+
+Tests client sharing between stores, collection setup and filter
+construction. Creating a client does not connect, and collection setup
+runs against a fake client, so no Qdrant server is needed.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import Distance, VectorParams
+
+from rag.vector_store import qdrant_store
+from rag.vector_store.qdrant_store import QdrantVectorStore
+
+
+@pytest.mark.asyncio
+class TestSharedClient:
+    """Test the reference-counted client shared between stores."""
+
+    async def test_same_settings_share_one_client(self):
+        first = QdrantVectorStore(url="http://qdrant-test:6333", collection_name="a")
+        second = QdrantVectorStore(url="http://qdrant-test:6333", collection_name="b")
+        other = QdrantVectorStore(url="http://qdrant-test:6333", collection_name="c", pool_size=8)
+
+        assert first.client is second.client
+        assert first.client is not other.client
+
+        for store in (first, second, other):
+            await store.close()
+
+    async def test_last_close_releases_client(self):
+        first = QdrantVectorStore(url="http://qdrant-test:6333", collection_name="a")
+        second = QdrantVectorStore(url="http://qdrant-test:6333", collection_name="b")
+        key = first._client_key
+
+        await first.close()
+        await first.close()  # Closing twice must not drop second's reference
+        assert qdrant_store._clients[key] is second.client
+
+        await second.close()
+        assert key not in qdrant_store._clients
+        assert key not in qdrant_store._client_refs
+
+
+class FakeCollectionClient:
+    """Records collection setup calls against an in-memory payload schema."""
+
+    def __init__(self, exists=False, indexed=(), create_error=None, vector_size=1536):
+        self.exists = exists
+        self.vector_size = vector_size
+        self.indexed = dict.fromkeys(indexed)
+        self.create_error = create_error
+        self.created = 0
+        self.checks = 0
+        self.index_calls = []
+
+    async def collection_exists(self, collection_name):
+        self.checks += 1
+        return self.exists
+
+    async def create_collection(self, collection_name, **kwargs):
+        if self.create_error is not None:
+            raise self.create_error
+        self.created += 1
+
+    async def get_collection(self, collection_name):
+        vectors = VectorParams(size=self.vector_size, distance=Distance.COSINE)
+        return SimpleNamespace(
+            config=SimpleNamespace(params=SimpleNamespace(vectors=vectors)),
+            payload_schema=self.indexed,
+        )
+
+    async def create_payload_index(self, collection_name, field_name, field_schema):
+        self.index_calls.append(field_name)
+
+
+@pytest.mark.asyncio
+class TestInitialize:
+    """Test collection creation and payload index back-fill."""
+
+    @staticmethod
+    async def initialize(collection_name, client, **kwargs):
+        store = QdrantVectorStore(
+            url="http://qdrant-test:6333", collection_name=collection_name, **kwargs
+        )
+        store.client = client
+        try:
+            await store.initialize()
+        finally:
+            await store.close()
+
+    async def test_creates_missing_collection_with_all_indexes(self):
+        client = FakeCollectionClient()
+
+        await self.initialize("init-new", client)
+
+        assert client.created == 1
+        assert sorted(client.index_calls) == sorted(QdrantVectorStore.PAYLOAD_INDEXES)
+
+    async def test_existing_collection_only_backfills_missing_indexes(self):
+        indexed = [name for name in QdrantVectorStore.PAYLOAD_INDEXES if name != "tags"]
+        client = FakeCollectionClient(exists=True, indexed=indexed)
+
+        await self.initialize("init-existing", client)
+
+        assert client.created == 0
+        assert client.index_calls == ["tags"]
+
+    async def test_concurrent_create_is_not_an_error(self):
+        conflict = UnexpectedResponse(409, "Conflict", b"", None)
+        client = FakeCollectionClient(create_error=conflict, indexed=QdrantVectorStore.PAYLOAD_INDEXES)
+
+        await self.initialize("init-race", client)
+
+        assert client.index_calls == []
+
+    async def test_other_create_errors_propagate(self):
+        client = FakeCollectionClient(create_error=UnexpectedResponse(500, "Error", b"", None))
+
+        with pytest.raises(UnexpectedResponse):
+            await self.initialize("init-failure", client)
+
+
+    async def test_repeat_initialize_skips_rpcs_for_same_config_only(self):
+        client = FakeCollectionClient()
+        first = QdrantVectorStore(url="http://qdrant-test:6333", collection_name="init-cache")
+        same = QdrantVectorStore(url="http://qdrant-test:6333", collection_name="init-cache")
+        resized = QdrantVectorStore(
+            url="http://qdrant-test:6333", collection_name="init-cache", vector_size=384
+        )
+        for store in (first, same, resized):
+            store.client = client
+
+        await first.initialize()
+        client.exists = True
+        await same.initialize()
+        await resized.initialize()
+
+        assert client.created == 1
+        assert len(client.index_calls) == 2 * len(QdrantVectorStore.PAYLOAD_INDEXES)
+
+        # Dropping the collection forgets it for every config
+        first._forget_collection()
+        client.index_calls.clear()
+        await same.initialize()
+        assert client.index_calls
+
+        for store in (first, same, resized):
+            await store.close()
+
+    async def test_closing_the_client_forgets_collections(self):
+        await self.initialize("init-closed", FakeCollectionClient())
+        client = FakeCollectionClient(exists=True, indexed=QdrantVectorStore.PAYLOAD_INDEXES)
+
+        await self.initialize("init-closed", client)
+
+        assert client.checks == 1
+
+
+class TestBuildFilter:
+    """Test metadata filter construction and caching."""
+
+    def test_equal_values_of_different_types_do_not_share_filters(self):
+        """True == 1, but each must get its own MatchValue."""
+        for value in (True, 1):
+            condition = QdrantVectorStore._build_filter({"flag": value}).must[0]
+
+            assert type(condition.match.value) is type(value)
+
+    def test_sequence_values_match_any(self):
+        built = QdrantVectorStore._build_filter({"user_id": ["u1", "u2"]})
+
+        assert built.must[0].match.any == ["u1", "u2"]
+        assert built is QdrantVectorStore._build_filter({"user_id": ("u1", "u2")})
+
+    def test_uncacheable_values_bypass_cache(self):
+        """Unhashable values reach Qdrant's validation instead of a hashing TypeError."""
+        with pytest.raises(ValidationError):
+            QdrantVectorStore._build_filter({"tags": [["nested"]]})
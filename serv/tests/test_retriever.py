@@ -0,0 +1,172 @@
+"""
+Tests for Retriever
+
+Tests query embedding memoization and result post-processing.
+"""
+
+import asyncio
+
+import pytest
+
+from rag.retrieval.retriever import Retriever
+from rag.vector_store.base_store import Document, SearchResult
+
+
+class CountingEmbedder:
+    """Records every text it is asked to embed."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def embed_text(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 1.0]
+
+    async def embed_batch(self, texts):
+        return [await self.embed_text(text) for text in texts]
+
+
+class EmptyStore:
+    """Vector store that never finds anything."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    async def search(self, query_embedding, top_k, filter_metadata=None):
+        return []
+
+    async def search_batch(self, query_embeddings, top_k, filter_metadata=None):
+        self.batch_sizes.append(len(query_embeddings))
+        return [[] for _ in query_embeddings]
+
+
+@pytest.mark.asyncio
+class TestQueryEmbeddingCache:
+    """Test memoized query embeddings."""
+
+    async def test_repeated_query_embedded_once(self):
+        """Queries that preprocess to the same text share one embedding."""
+        embedder = CountingEmbedder()
+        retriever = Retriever(embedder, EmptyStore())
+
+        await retriever.retrieve("how to focus?")
+        await retriever.retrieve("  how   to focus?\n")
+
+        assert embedder.calls == ["how to focus?"]
+
+    async def test_warmup_does_not_populate_cache(self):
+        embedder = CountingEmbedder()
+        retriever = Retriever(embedder, EmptyStore())
+
+        await retriever.warmup()
+
+        assert len(embedder.calls) == 1
+        assert len(retriever._query_cache) == 0
+
+    async def test_warmup_prefetches_queries(self):
+        """Warm-up queries are embedded once and then served from the cache."""
+        embedder = CountingEmbedder()
+        retriever = Retriever(embedder, EmptyStore())
+
+        await retriever.warmup(["how to focus?", "phone distractions"])
+        await retriever.retrieve("  how to focus?")
+
+        assert embedder.calls == ["how to focus?", "phone distractions"]
+
+    async def test_retrieve_batch_embeds_only_uncached_queries(self):
+        embedder = CountingEmbedder()
+        retriever = Retriever(embedder, EmptyStore())
+        await retriever.retrieve("focus")
+
+        results = await retriever.retrieve_batch(["focus", "sleep", "phone"])
+
+        assert results == [[], [], []]
+        assert embedder.calls == ["focus", "sleep", "phone"]
+
+    async def test_clear_cache(self):
+        embedder = CountingEmbedder()
+        retriever = Retriever(embedder, EmptyStore())
+
+        await retriever.retrieve("how to focus?")
+        retriever.clear_cache()
+        await retriever.retrieve("how to focus?")
+
+        assert len(embedder.calls) == 2
+
+
+@pytest.mark.asyncio
+class TestSearchCoalescing:
+    """Test micro-batching of concurrent searches."""
+
+    async def test_concurrent_retrieves_share_one_batch(self):
+        store = EmptyStore()
+        retriever = Retriever(CountingEmbedder(), store, batch_window_ms=5, max_batch=32)
+
+        results = await asyncio.gather(*[retriever.retrieve(f"q{i}") for i in range(5)])
+
+        assert results == [[]] * 5
+        assert store.batch_sizes == [5]
+        await retriever.close()
+
+    async def test_full_batch_flushes_early(self):
+        store = EmptyStore()
+        retriever = Retriever(CountingEmbedder(), store, batch_window_ms=1000, max_batch=2)
+
+        await asyncio.wait_for(
+            asyncio.gather(*[retriever.retrieve(f"q{i}") for i in range(4)]), timeout=0.5
+        )
+
+        assert store.batch_sizes == [2, 2]
+        await retriever.close()
+
+    async def test_full_batch_cancels_window_timer(self):
+        store = EmptyStore()
+        retriever = Retriever(CountingEmbedder(), store, batch_window_ms=1000, max_batch=2)
+
+        await asyncio.gather(retriever.retrieve("a"), retriever.retrieve("b"))
+        await asyncio.sleep(0)
+
+        assert not retriever._flush_timers
+        assert not retriever._batch_tasks
+
+    async def test_close_cancels_waiting_searches(self):
+        store = EmptyStore()
+        retriever = Retriever(CountingEmbedder(), store, batch_window_ms=1000)
+
+        pending = asyncio.create_task(retriever.retrieve("a"))
+        await asyncio.sleep(0.01)
+        await retriever.close()
+
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        assert store.batch_sizes == []
+
+    async def test_different_filters_are_not_mixed(self):
+        store = EmptyStore()
+        retriever = Retriever(CountingEmbedder(), store, batch_window_ms=5)
+
+        await asyncio.gather(
+            retriever.retrieve("a", filter_metadata={"category": "x"}),
+            retriever.retrieve("b", filter_metadata={"category": "y"}),
+        )
+
+        assert store.batch_sizes == [1, 1]
+        await retriever.close()
+
+
+class TestPostProcess:
+    """Test score filtering and deduplication."""
+
+    def test_threshold_and_dedup_keep_order(self):
+        retriever = Retriever(CountingEmbedder(), EmptyStore(), min_score_threshold=0.5)
+        results = [
+            SearchResult(document=Document(id=doc_id, content=doc_id), score=score, rank=rank)
+            for rank, (doc_id, score) in enumerate([("a", 0.9), ("b", 0.8), ("a", 0.7), ("c", 0.4), ("d", 0.5)])
+        ]
+
+        processed = retriever._post_process(results)
+
+        assert [(r.document.id, r.score) for r in processed] == [("a", 0.9), ("b", 0.8), ("d", 0.5)]
+
+    def test_empty_results(self):
+        assert Retriever(CountingEmbedder(), EmptyStore())._post_process([]) == []
@@ -5,6 +5,7 @@ Startup Validation Script for Render Deployment
 Run this before the main app to diagnose issues.
 """
 
+import importlib.util
 import os
 import sys
 
@@ -109,12 +110,13 @@ def check_imports():
         "sentence_transformers",
     ]
     
+    # find_spec only locates the package - importing sentence_transformers
+    # (torch) and qdrant_client (grpcio) would add seconds to a diagnostic
     missing = []
     for package in required_packages:
-        try:
-            __import__(package)
+        if importlib.util.find_spec(package) is not None:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package} - NOT INSTALLED")
             missing.append(package)
     